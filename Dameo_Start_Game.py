@@ -50,6 +50,9 @@ def main():
                     gui.square_size = square_size
                     board=Board(size)
                     board.start_game(gui, screen)
+                    # Termina os processos e a memória partilhada dos jogadores do jogo anterior
+                    player1.close()
+                    player2.close()
                     player1 = Player(players[0], players[2], WHITE)
                     player2 = Player(players[1], players[3], BLACK)
                     selected_piece = None
@@ -70,24 +73,28 @@ def main():
                     selected_piece = player.get_human_move(board, gui, screen, winner, square_size, selected_piece)
 
 
-                # Se for a vez de um jogador IA
+                # Se for a vez de um jogador IA (o movimento já inclui a captura múltipla completa)
                 if player.type != 'Humano' and turn == player.team:
                     selected_piece = player.get_ai_move(board)
+                    keep_capturing = False
 
-                # Verifica se a peça pode capturar
-                if not selected_piece.king:
-                    selected_piece.check_catch(board)
+                # Jogadas humanas são feitas salto a salto: verifica se a peça pode continuar a capturar
                 else:
-                    selected_piece.check_catch_king(board)
+                    if not selected_piece.king:
+                        selected_piece.check_catch(board)
+                    else:
+                        selected_piece.check_catch_king(board)
+                    keep_capturing = selected_piece.legal and selected_piece.has_caught
 
                 # Se a peça puder capturar, continua o turno
-                if selected_piece.legal and selected_piece.has_caught:
+                if keep_capturing:
                     pass  # NÃO É PRECISO FAZER NADA
 
                 # Se a peça não puder capturar, passa o turno para o próximo jogador
                 else:
                     is_king = selected_piece.king
-                    selected_piece.transform_king()
+                    selected_piece.transform_king(board)
+                    selected_piece.has_caught = False  # A captura terminou
 
 
                     selected_piece = None  # Desativa a peça selecionada
@@ -121,5 +128,9 @@ def main():
                     pygame.display.flip()
                     break
 
+    # Termina os processos e a memória partilhada das pesquisas da IA
+    player1.close()
+    player2.close()
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
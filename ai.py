@@ -1,9 +1,145 @@
 import random
+from array import array
 from vars import *  # Importa variáveis globais (ex: cores, tamanhos)
 from board import Board  # Importa a classe Board para representar o tabuleiro
+from bitboard import BitBoard
 import math
-from copy import deepcopy  # Importa deepcopy para criar cópias independentes de objetos
 import time  # Importa o módulo time para medir o tempo de execução
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from transposition import TranspositionTable, SharedTranspositionTable, EXACT, LOWER_BOUND, UPPER_BOUND
+from rollout import RolloutEngine, evaluation_weights, np
+
+CHECK_TIME_EVERY = 256  # Número de nós entre cada verificação do relógio
+ASPIRATION_WINDOW = 2  # Meia largura da janela de aspiração à volta do valor da iteração anterior
+NULL_MOVE_REDUCTION = 2  # Profundidade poupada na pesquisa depois de passar a vez
+NULL_MOVE_MIN_PIECES = 4  # Com menos peças o jogador pode ser obrigado a piorar (zugzwang): não se passa a vez
+LMR_MIN_DEPTH = 3  # Profundidade mínima para reduzir movimentos tardios
+LMR_MIN_INDEX = 3  # Os primeiros movimentos da lista ordenada (tabela, matadores) nunca são reduzidos
+LMR_BASE = 0.5  # Redução base dos movimentos tardios
+LMR_DIVISOR = 2.25  # Quanto maior, menor a redução com a profundidade e a posição na lista
+REDUCTION_TABLE_SIZE = 64  # Profundidades e posições na lista cobertas pela tabela de reduções
+VIRTUAL_LOSS = 1  # Derrotas provisórias somadas ao caminho de uma iteração em curso (MCTS com várias threads)
+PRIOR_TEMPERATURE = 1.0  # Temperatura do softmax que converte as avaliações dos movimentos em priors
+WIDENING_EXPONENT = 0.5  # Com alargamento progressivo, um nó com n visitas considera widening * n ** WIDENING_EXPONENT filhos
+
+
+class SearchTimeout(Exception):
+    """Lançada quando o tempo da pesquisa se esgota a meio de uma iteração."""
+
+
+# Estado de cada processo auxiliar da pesquisa paralela
+worker_minimax = None  # Instância do Minimax do processo (conserva a tabela de transposição entre tarefas)
+worker_alpha = None  # Melhor valor da raiz encontrado até agora, partilhado por todos os processos
+
+
+def init_worker(shared_alpha, depth, options):
+    """
+    Prepara um processo auxiliar da pesquisa paralela.
+
+    Args:
+        shared_alpha (multiprocessing.Value): O Alpha da raiz partilhado entre processos.
+        depth (int): A profundidade máxima da pesquisa.
+        options (dict): Os restantes argumentos do Minimax (tabela, quiescência, poda seletiva).
+    """
+    global worker_minimax, worker_alpha
+    worker_alpha = shared_alpha
+    worker_minimax = Minimax(depth, **options)
+
+
+def search_root_move(state, move, depth, turn, evaluation_func, deadline, search_id):
+    """
+    Pesquisa um movimento da raiz num processo auxiliar.
+
+    A janela começa um ponto abaixo do Alpha partilhado, para que um movimento
+    empatado com o melhor até agora tenha também o valor exato (o desempate é
+    feito pela ordem dos movimentos, como na pesquisa sequencial).
+
+    Args:
+        state (tuple): A posição da raiz serializada com BitBoard.pack.
+        move (tuple): O movimento da raiz a pesquisar.
+        depth (int): A profundidade da pesquisa (incluindo o movimento da raiz).
+        turn (int): A cor do jogador da raiz.
+        evaluation_func (int): Qual função de avaliação usar (1, 2 ou 3).
+        deadline (float): O instante (time.time) em que a pesquisa tem de parar, ou None.
+        search_id (int): Identificador da pesquisa da raiz (muda a cada jogada).
+
+    Returns:
+        tuple: O valor do movimento (None se o tempo se esgotou) e os nós visitados.
+    """
+    minimax = worker_minimax
+    if minimax.search_id != search_id:
+        minimax.start_search(turn, evaluation_func)
+        minimax.search_id = search_id
+    board = Board.from_bitboard(BitBoard.unpack(state))
+
+    nodes = minimax.nodes
+    if deadline is not None:
+        if time.time() >= deadline:
+            return None, 0  # A tarefa começou depois de o tempo acabar
+        # Os relógios de cada processo não são comparáveis: converte para o relógio local
+        minimax.deadline = time.perf_counter() + (deadline - time.time())
+    alpha = worker_alpha.value
+    board.make_move(move)
+    try:
+        eval = minimax.minimax(board, depth - 1, board.turn == turn, alpha - 1, float('inf'), turn, evaluation_func, 1)
+    except SearchTimeout:
+        return None, minimax.nodes - nodes
+    finally:
+        minimax.deadline = None
+
+    with worker_alpha.get_lock():
+        if eval > worker_alpha.value:
+            worker_alpha.value = eval
+    return eval, minimax.nodes - nodes
+
+
+def init_smp_worker(table_name, table_megabytes, stop_flag, depth, options):
+    """
+    Prepara um processo auxiliar do Lazy SMP, ligado à tabela de transposição partilhada.
+
+    Args:
+        table_name (str): O nome da memória partilhada da tabela.
+        table_megabytes (float): O tamanho da tabela em MB.
+        stop_flag (multiprocessing.Value): Fica a 1 quando o processo principal termina a pesquisa.
+        depth (int): A profundidade máxima da pesquisa.
+        options (dict): Os restantes argumentos do Minimax (quiescência, poda seletiva).
+    """
+    global worker_minimax
+    worker_minimax = Minimax(depth, table_megabytes=0, **options)
+    worker_minimax.table = SharedTranspositionTable(table_megabytes, name=table_name)
+    worker_minimax.stop_flag = stop_flag
+
+
+def smp_search(state, depth, turn, evaluation_func, helper):
+    """
+    Pesquisa a raiz num processo auxiliar do Lazy SMP até o processo principal terminar.
+
+    Os processos auxiliares alternam a profundidade inicial e baralham a ordem
+    dos movimentos da raiz, para não pesquisarem todos a mesma árvore; o que
+    encontram chega ao processo principal através da tabela partilhada.
+
+    Args:
+        state (tuple): A posição da raiz serializada com BitBoard.pack.
+        depth (int): A profundidade máxima da pesquisa do processo principal.
+        turn (int): A cor do jogador da raiz.
+        evaluation_func (int): Qual função de avaliação usar (1, 2 ou 3).
+        helper (int): O número do processo auxiliar (a partir de 1).
+
+    Returns:
+        tuple: Os nós visitados, os acertos e as consultas à tabela partilhada.
+    """
+    minimax = worker_minimax
+    minimax.table_owner = (turn, evaluation_func)  # A tabela é preparada pelo processo principal
+    minimax.reset_heuristics()
+    minimax.table.hits = minimax.table.misses = 0
+    board = Board.from_bitboard(BitBoard.unpack(state))
+
+    moves = board.get_all_moves(turn)
+    random.Random(helper).shuffle(moves)
+    minimax.iterative_deepening(board, moves, depth + 1, turn, evaluation_func, None, time.perf_counter(), 1 + helper % 2)
+    return minimax.nodes, minimax.table.hits, minimax.table.hits + minimax.table.misses
 
 
 class Minimax:
@@ -11,16 +147,55 @@ class Minimax:
     Implementação do algoritmo Minimax com poda Alpha-Beta para a tomada de decisões da IA.
     """
 
-    def __init__(self, depth):
+    def __init__(self, depth, table_megabytes=16, time_limit=None, quiescence_ply=6, null_move=True, late_move_reductions=True, workers=1, lazy_smp=False):
         """
         Inicializa o objeto Minimax.
 
         Args:
             depth (int): A profundidade máxima da árvore de busca Minimax.
+            table_megabytes (float): Memória da tabela de transposição em MB (0 para não usar tabela).
+            time_limit (float): Tempo máximo por jogada em segundos (None para pesquisar sempre até à profundidade máxima).
+            quiescence_ply (int): Número máximo de capturas seguidas pesquisadas nas folhas (0 para avaliar diretamente).
+            null_move (bool): Se usa a poda de movimento nulo.
+            late_move_reductions (bool): Se reduz a profundidade dos movimentos normais tardios.
+            workers (int): Número de processos que pesquisam os movimentos da raiz em paralelo (1 para pesquisar sequencialmente).
+            lazy_smp (bool): Com mais de um processo, em vez de dividir a raiz todos pesquisam a posição inteira,
+                             partilhando uma tabela de transposição em memória partilhada (Lazy SMP).
         """
         self.depth = depth
-
-    def minimax(self, board, depth, maximizing_player, alpha, beta, turn, evaluation_func):
+        self.time_limit = time_limit
+        self.quiescence_ply = quiescence_ply
+        self.deadline = None  # Instante em que a pesquisa atual tem de parar (None se não houver limite)
+        self.nodes = 0  # Nós visitados na pesquisa atual
+        self.completed_depth = 0  # Última profundidade pesquisada por completo
+        self.score = None  # Valor do melhor movimento na última profundidade completa
+        self.researches = 0  # Pesquisas repetidas por o valor cair fora da janela de aspiração
+        self.table = TranspositionTable(table_megabytes) if table_megabytes else None  # Tabela de transposição
+        self.table_owner = None  # (turn, evaluation_func) a que se referem os valores guardados na tabela
+        self.killers = {}  # Movimentos normais que provocaram cortes, por ply (dois por ply)
+        self.history = {WHITE: {}, BLACK: {}}  # Pontuação dos movimentos normais que provocaram cortes, por (origem, destino)
+        self.cutoffs = 0  # Nós em que houve um corte Alpha-Beta
+        self.first_move_cutoffs = 0  # Nós em que o corte aconteceu logo no primeiro movimento
+        self.null_move = null_move
+        self.late_move_reductions = late_move_reductions
+        self.reductions = self.build_reduction_table(LMR_BASE, LMR_DIVISOR)  # Redução por [profundidade][posição na lista]
+        self.null_cutoffs = 0  # Cortes obtidos passando a vez
+        self.reduced = 0  # Movimentos pesquisados com profundidade reduzida
+        self.reduction_researches = 0  # Movimentos reduzidos que tiveram de ser pesquisados outra vez
+        self.table_megabytes = table_megabytes
+        self.workers = workers
+        self.pool = None  # Processos da pesquisa paralela (criados na primeira pesquisa)
+        self.shared_alpha = None  # Alpha da raiz partilhado com os processos
+        self.search_id = 0  # Identifica a pesquisa atual perante os processos
+        self.lazy_smp = lazy_smp and workers > 1 and bool(table_megabytes)  # Sem tabela não há nada a partilhar
+        if self.lazy_smp:
+            self.table = SharedTranspositionTable(table_megabytes)
+        self.stop_flag = None  # No Lazy SMP, indica aos processos auxiliares que a pesquisa terminou
+        self.worker_nodes = []  # Nós visitados por cada processo na última pesquisa Lazy SMP (o principal primeiro)
+        self.shared_hits = 0  # Acertos na tabela partilhada na última pesquisa Lazy SMP (todos os processos)
+        self.shared_probes = 0  # Consultas à tabela partilhada na última pesquisa Lazy SMP (todos os processos)
+
+    def minimax(self, board, depth, maximizing_player, alpha, beta, turn, evaluation_func, ply=0, allow_null=True):
         """
         Implementa o algoritmo Minimax com poda Alpha-Beta recursivamente.
 
@@ -30,132 +205,753 @@ class Minimax:
             maximizing_player (bool): True se o nó atual representa um movimento do jogador maximizador, False caso contrário.
             alpha (float): O melhor valor que o jogador maximizador pode garantir até agora.
             beta (float): O melhor valor que o jogador minimizador pode garantir até agora.
-            turn (int): A cor do jogador atual (WHITE ou BLACK).
+            turn (int): A cor do jogador maximizador (WHITE ou BLACK), do ponto de vista do qual se avalia o tabuleiro.
             evaluation_func (int): Qual função de avaliação usar (1, 2 ou 3).
+            ply (int): A distância (em movimentos) à raiz da pesquisa.
+            allow_null (bool): False logo a seguir a uma passagem de vez (não se passa duas vezes seguidas).
 
         Returns:
             float: O valor heurístico do nó atual.
-        """
-        if depth == 0 or board.check_winner():
-            # Se atingiu a profundidade máxima ou um estado terminal (vitória/derrota/empate), avalia o estado do tabuleiro
-            if evaluation_func == 1:
-                return self.evaluate(board, turn)
-            elif evaluation_func == 2:
-                return self.evaluate_2(board, turn)
-            elif evaluation_func == 3:
-                return self.evaluate_3(board, turn)
 
-        # Alterna o turno para o próximo jogador
-        turn = WHITE if turn == BLACK else BLACK
-
-        # Encontra os movimentos legais para o jogador atual
-        legal_pieces, legal_moves = board.find_available_moves(turn)
+        Como as funções de avaliação devolvem inteiros, os movimentos depois do
+        primeiro são pesquisados com uma janela nula (largura 1), só para provar
+        que não são melhores; se o forem, voltam a ser pesquisados com a janela
+        completa (Principal Variation Search). Os movimentos normais tardios são
+        primeiro pesquisados com profundidade reduzida, e quando a posição já é
+        boa o suficiente tenta-se um corte passando a vez ao adversário.
+        """
+        self.visit_node()
+
+        # Na profundidade máxima só se continuam as capturas, para não avaliar a meio de uma troca de peças
+        if depth == 0:
+            return self.quiescence(board, maximizing_player, alpha, beta, turn, evaluation_func, 0)
+
+        # Consulta a tabela de transposição (a mesma posição pode ser alcançada por ordens de movimentos diferentes)
+        key = board.search_hash
+        alpha_original, beta_original = alpha, beta
+        hash_move = None
+        if self.table is not None:
+            entry = self.table.probe(key)
+            if entry is not None:
+                hash_move = entry[4]  # O melhor movimento guardado serve para ordenar, mesmo com profundidade insuficiente
+            if entry is not None and entry[1] >= depth:
+                score, flag = entry[2], entry[3]
+                if flag == EXACT:
+                    return score
+                elif flag == LOWER_BOUND:
+                    alpha = max(alpha, score)
+                elif flag == UPPER_BOUND:
+                    beta = min(beta, score)
+                if beta <= alpha:
+                    return score
+
+        # Gera os movimentos legais do jogador a jogar (o turno pode manter-se numa captura múltipla)
+        moves, capturing = self.generate_moves(board)
+
+        # Estado terminal (vitória/derrota/empate): reaproveita os movimentos gerados para saber se o jogador pode mover-se
+        if board.check_winner(moves=moves[:1]):
+            return self.evaluate_board(board, turn, evaluation_func)
+
+        # Poda de movimento nulo: se mesmo passando a vez o resultado sai da janela, o nó não interessa.
+        # Não se usa com capturas (são obrigatórias) nem com poucas peças (zugzwang)
+        own_pieces = board.all_pieces_black if board.turn == BLACK else board.all_pieces_white
+        if (allow_null and self.null_move and ply > 0 and not capturing and depth > NULL_MOVE_REDUCTION
+                and len(own_pieces) >= NULL_MOVE_MIN_PIECES):
+            eval = self.null_move_search(board, depth, maximizing_player, alpha, beta, turn, evaluation_func, ply)
+            if eval is not None:
+                return eval
+
+        moves = self.order_moves(board, moves, capturing, hash_move, ply)
 
+        best_move = None
         if maximizing_player:
             # Jogador Maximizador (IA)
-            max_eval = float('-inf')  # Inicializa com o menor valor possível
-            for i, piece in enumerate(legal_pieces):
-                for move in legal_moves[i]:
-                    # Itera sobre cada possível movimento
-                    # Efetua o movimento
-                    previous_row = piece.row
-                    previous_col = piece.col
-                    board.chessboard[piece.row][piece.col] = None  # Remove a peça da posição atual
-                    piece.move(move[0], move[1], board)  # Move a peça para a nova posição
-                    board.chessboard[piece.row][piece.col] = piece  # Atualiza a posição da peça no tabuleiro
+            best_eval = float('-inf')  # Inicializa com o menor valor possível
+            for index, move in enumerate(moves):
+                # Itera sobre cada possível movimento
+                undo = board.make_move(move)  # Efetua o movimento
+                try:
+                    # Calcula o valor do nó filho recursivamente
+                    if index == 0:
+                        # O primeiro movimento (variação principal) é pesquisado com a janela completa
+                        eval = self.minimax(board, depth - 1, board.turn == turn, alpha, beta, turn, evaluation_func, ply + 1)
+                    else:
+                        # Os movimentos normais tardios começam por ser pesquisados com menos profundidade
+                        reduction = self.reduction(depth, index) if not capturing else 0
+                        eval = self.minimax(board, depth - 1 - reduction, board.turn == turn, alpha, alpha + 1, turn, evaluation_func, ply + 1)
+                        if reduction:
+                            self.reduced += 1
+                            if eval > alpha:
+                                # Afinal pode ser melhor: repete com a profundidade completa
+                                self.reduction_researches += 1
+                                eval = self.minimax(board, depth - 1, board.turn == turn, alpha, alpha + 1, turn, evaluation_func, ply + 1)
+                        if alpha < eval < beta:
+                            # Afinal é melhor: repete a pesquisa com a janela completa
+                            eval = self.minimax(board, depth - 1, board.turn == turn, alpha, beta, turn, evaluation_func, ply + 1)
+                finally:
+                    board.unmake_move(undo)  # Desfaz o movimento (mesmo que a pesquisa seja interrompida)
+
+                if eval > best_eval:
+                    best_eval = eval  # Atualiza o melhor valor encontrado
+                    best_move = move
+                alpha = max(alpha, eval)  # Atualiza o valor de Alpha
 
+                if beta <= alpha:
+                    self.record_cutoff(board, move, capturing, depth, ply, index)
+                    break  # Pruning (poda Alpha-Beta)
+        else:
+            # Jogador Minimizador (oponente)
+            best_eval = float('inf')  # Inicializa com o maior valor possível
+            for index, move in enumerate(moves):
+                # Itera sobre cada possível movimento
+                undo = board.make_move(move)  # Efetua o movimento
+                try:
                     # Calcula o valor do nó filho recursivamente
-                    eval = self.minimax(deepcopy(board), depth - 1, False, alpha, beta, turn, evaluation_func)
+                    if index == 0:
+                        # O primeiro movimento (variação principal) é pesquisado com a janela completa
+                        eval = self.minimax(board, depth - 1, board.turn == turn, alpha, beta, turn, evaluation_func, ply + 1)
+                    else:
+                        # Os movimentos normais tardios começam por ser pesquisados com menos profundidade
+                        reduction = self.reduction(depth, index) if not capturing else 0
+                        eval = self.minimax(board, depth - 1 - reduction, board.turn == turn, beta - 1, beta, turn, evaluation_func, ply + 1)
+                        if reduction:
+                            self.reduced += 1
+                            if eval < beta:
+                                # Afinal pode ser melhor: repete com a profundidade completa
+                                self.reduction_researches += 1
+                                eval = self.minimax(board, depth - 1, board.turn == turn, beta - 1, beta, turn, evaluation_func, ply + 1)
+                        if alpha < eval < beta:
+                            # Afinal é melhor: repete a pesquisa com a janela completa
+                            eval = self.minimax(board, depth - 1, board.turn == turn, alpha, beta, turn, evaluation_func, ply + 1)
+                finally:
+                    board.unmake_move(undo)  # Desfaz o movimento (mesmo que a pesquisa seja interrompida)
+
+                if eval < best_eval:
+                    best_eval = eval  # Atualiza o melhor valor encontrado
+                    best_move = move
+                beta = min(beta, eval)  # Atualiza o valor de Beta
+
+                if beta <= alpha:
+                    self.record_cutoff(board, move, capturing, depth, ply, index)
+                    break  # Pruning (poda Alpha-Beta)
+
+        # Guarda o resultado na tabela de transposição, com o tipo de limite em relação à janela original
+        if self.table is not None:
+            if best_eval <= alpha_original:
+                flag = UPPER_BOUND
+            elif best_eval >= beta_original:
+                flag = LOWER_BOUND
+            else:
+                flag = EXACT
+            self.table.store(key, depth, best_eval, flag, best_move)
 
-                    # Desfaz o movimento
-                    board.chessboard[piece.row][piece.col] = None  # Remove a peça da nova posição
-                    piece.move(previous_row, previous_col, board)  # Move a peça de volta para a posição original
-                    board.chessboard[piece.row][piece.col] = piece  # Atualiza a posição da peça no tabuleiro
+        return best_eval  # Retorna o melhor valor encontrado
 
-                    max_eval = max(max_eval, eval)  # Atualiza o melhor valor encontrado
-                    alpha = max(alpha, eval)  # Atualiza o valor de Alpha
+    def execute_minimax(self, board, depth, turn, evaluation_func, time_limit=None):
+        """
+        Executa o algoritmo Minimax para determinar o melhor movimento.
 
-                    if beta <= alpha:
-                        break  # Pruning (poda Alpha-Beta)
+        Usa aprofundamento iterativo: pesquisa com profundidade 1, 2, 3... até
+        à profundidade máxima ou até o tempo da jogada se esgotar. A iteração
+        interrompida é descartada e devolve-se o melhor movimento da última
+        profundidade completa. Os movimentos são feitos e desfeitos
+        diretamente no tabuleiro recebido, que no fim fica no mesmo estado.
 
-            return max_eval  # Retorna o melhor valor encontrado
-        else:
-            # Jogador Minimizador (oponente)
-            min_eval = float('inf')  # Inicializa com o maior valor possível
-            for i, piece in enumerate(legal_pieces):
-                for move in legal_moves[i]:
-                    # Itera sobre cada possível movimento
-                    # Efetua o movimento
-                    previous_row = piece.row
-                    previous_col = piece.col
-                    board.chessboard[piece.row][piece.col] = None  # Remove a peça da posição atual
-                    piece.move(move[0], move[1], board)  # Move a peça para a nova posição
-                    board.chessboard[piece.row][piece.col] = piece  # Atualiza a posição da peça no tabuleiro
+        Args:
+            board (Board): O estado atual do tabuleiro.
+            depth (int): A profundidade máxima da árvore de busca.
+            turn (int): A cor do jogador atual.
+            evaluation_func (int): Qual função de avaliação usar (1, 2 ou 3).
+            time_limit (float): Tempo máximo em segundos (por omissão usa o do objeto; None para não limitar).
 
-                    # Calcula o valor do nó filho recursivamente
-                    eval = self.minimax(board, depth - 1, True, alpha, beta, turn, evaluation_func)
+        Returns:
+            tuple: O melhor movimento, isto é, o caminho da peça ((row, col), (new_row, new_col), ...).
+        """
+        if time_limit is None:
+            time_limit = self.time_limit
+        start_time = time.perf_counter()
+
+        self.start_search(turn, evaluation_func)
+        self.search_id += 1
+        moves = board.get_all_moves(turn)
+        if len(moves) <= 1:
+            # Com um só movimento possível não há nada a pesquisar
+            return moves[0] if moves else None
+
+        if not self.lazy_smp:
+            return self.iterative_deepening(board, moves, depth, turn, evaluation_func, time_limit, start_time)
+
+        # Lazy SMP: os processos auxiliares pesquisam a mesma raiz enquanto este faz a pesquisa principal
+        helpers = self.start_helpers(board, depth, turn, evaluation_func)
+        try:
+            return self.iterative_deepening(board, moves, depth, turn, evaluation_func, time_limit, start_time)
+        finally:
+            self.stop_helpers(helpers)
+
+    def iterative_deepening(self, board, moves, depth, turn, evaluation_func, time_limit, start_time, first_depth=1):
+        """
+        Pesquisa a raiz com profundidades crescentes até à profundidade máxima ou ao fim do tempo.
 
-                    # Desfaz o movimento
-                    board.chessboard[piece.row][piece.col] = None  # Remove a peça da nova posição
-                    piece.move(previous_row, previous_col, board)  # Move a peça de volta para a posição original
-                    board.chessboard[piece.row][piece.col] = piece  # Atualiza a posição da peça no tabuleiro
+        Args:
+            board (Board): O estado atual do tabuleiro.
+            moves (list): Os movimentos legais do jogador atual (a lista é reordenada).
+            depth (int): A profundidade máxima.
+            turn (int): A cor do jogador atual.
+            evaluation_func (int): Qual função de avaliação usar (1, 2 ou 3).
+            time_limit (float): Tempo máximo em segundos (None para não limitar).
+            start_time (float): O instante (time.perf_counter) em que a jogada começou a ser pensada.
+            first_depth (int): A profundidade da primeira iteração.
 
-                    min_eval = min(min_eval, eval)  # Atualiza o melhor valor encontrado
-                    beta = min(beta, eval)  # Atualiza o valor de Beta
+        Returns:
+            tuple: O melhor movimento da última profundidade completa.
+        """
+        best_move = moves[0]
+        for current_depth in range(first_depth, depth + 1):
+            # A primeira iteração é sempre completa, para haver sempre um movimento a devolver
+            if time_limit is not None and current_depth > first_depth:
+                self.deadline = start_time + time_limit
+            try:
+                if self.workers > 1 and not self.lazy_smp and current_depth > 1:
+                    best_move, self.score = self.search_root_parallel(board, moves, current_depth, turn, evaluation_func)
+                else:
+                    best_move, self.score = self.aspiration_search(board, moves, current_depth, turn, evaluation_func, self.score)
+            except SearchTimeout:
+                break  # Descarta a iteração interrompida
+            finally:
+                self.deadline = None
+            self.completed_depth = current_depth
+
+            if time_limit is not None:
+                # A próxima iteração demora bastante mais do que esta: só começa se houver tempo para a terminar
+                if time.perf_counter() - start_time >= time_limit / 2:
+                    break
 
-                    if beta <= alpha:
-                        break  # Pruning (poda Alpha-Beta)
+            # O melhor movimento é pesquisado primeiro na iteração seguinte
+            moves.remove(best_move)
+            moves.insert(0, best_move)
 
-            return min_eval  # Retorna o melhor valor encontrado
+        return best_move  # Retorna a posição da peça e o melhor movimento
 
-    def execute_minimax(self, board, depth, turn, evaluation_func):
+    def start_search(self, turn, evaluation_func):
         """
-        Executa o algoritmo Minimax para determinar o melhor movimento.
+        Prepara as estruturas da pesquisa para uma nova jogada.
+
+        Args:
+            turn (int): A cor do jogador atual.
+            evaluation_func (int): Qual função de avaliação usar (1, 2 ou 3).
+        """
+        if self.lazy_smp and self.table is None:
+            # A tabela partilhada foi libertada por close: cria-se uma nova
+            self.table = SharedTranspositionTable(self.table_megabytes)
+            self.table_owner = None
+        # Os valores da tabela são do ponto de vista de um jogador e de uma função de avaliação
+        if self.table is not None:
+            if self.table_owner != (turn, evaluation_func):
+                self.table.clear()
+                self.table_owner = (turn, evaluation_func)
+            self.table.new_search()
+        self.reset_heuristics()
+
+    def reset_heuristics(self):
+        """Reinicia os contadores e as heurísticas de ordenação no início de uma pesquisa."""
+        self.nodes = 0
+        self.completed_depth = 0
+        self.score = None
+        self.researches = 0
+        self.cutoffs = self.first_move_cutoffs = 0
+        self.null_cutoffs = self.reduced = self.reduction_researches = 0
+        self.killers = {}  # Os movimentos matadores só fazem sentido na mesma pesquisa
+        for scores in self.history.values():
+            # O histórico de pesquisas anteriores conta menos
+            for square_pair in scores:
+                scores[square_pair] //= 2
+
+    def get_pool(self):
+        """
+        Obtém os processos da pesquisa paralela, criando-os na primeira utilização.
+
+        Returns:
+            ProcessPoolExecutor: Os processos auxiliares.
+        """
+        if self.pool is None:
+            self.shared_alpha = multiprocessing.Value('d', float('-inf'))
+            options = {
+                'table_megabytes': self.table_megabytes,
+                'quiescence_ply': self.quiescence_ply,
+                'null_move': self.null_move,
+                'late_move_reductions': self.late_move_reductions,
+            }
+            self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=init_worker,
+                                            initargs=(self.shared_alpha, self.depth, options))
+        return self.pool
+
+    def close(self):
+        """
+        Termina os processos da pesquisa paralela (se existirem) e liberta a tabela partilhada.
+
+        O objeto continua a poder ser usado: no Lazy SMP, a pesquisa seguinte cria uma nova tabela partilhada.
+        """
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+        if isinstance(self.table, SharedTranspositionTable):
+            self.table.close()
+            self.table = None
+            self.table_owner = None
+
+    def get_smp_pool(self):
+        """
+        Obtém os processos auxiliares do Lazy SMP, criando-os na primeira utilização.
+
+        Returns:
+            ProcessPoolExecutor: Os processos auxiliares (um a menos do que workers; o principal também pesquisa).
+        """
+        if self.pool is None:
+            self.stop_flag = multiprocessing.Value('b', 0)
+            options = {
+                'quiescence_ply': self.quiescence_ply,
+                'null_move': self.null_move,
+                'late_move_reductions': self.late_move_reductions,
+            }
+            self.pool = ProcessPoolExecutor(max_workers=self.workers - 1, initializer=init_smp_worker,
+                                            initargs=(self.table.name, self.table_megabytes, self.stop_flag, self.depth, options))
+        return self.pool
+
+    def start_helpers(self, board, depth, turn, evaluation_func):
+        """
+        Põe os processos auxiliares do Lazy SMP a pesquisar a posição atual.
 
         Args:
             board (Board): O estado atual do tabuleiro.
-            depth (int): A profundidade da árvore de busca.
+            depth (int): A profundidade máxima da pesquisa.
             turn (int): A cor do jogador atual.
             evaluation_func (int): Qual função de avaliação usar (1, 2 ou 3).
 
         Returns:
-            tuple: Uma tupla contendo a posição da peça e o movimento a ser realizado.
+            list: As tarefas dos processos auxiliares.
         """
-        legal_pieces, legal_moves = board.find_available_moves(turn)  # Encontra movimentos legais
-        best_eval = float('-inf')  # Inicializa com o menor valor possível
-        best_move = None
-        best_piece = None
+        pool = self.get_smp_pool()
+        self.stop_flag.value = 0
+        state = board.to_bitboard().pack()
+        self.table.hits = self.table.misses = 0
+        return [pool.submit(smp_search, state, depth, turn, evaluation_func, helper) for helper in range(1, self.workers)]
+
+    def stop_helpers(self, helpers):
+        """
+        Para os processos auxiliares do Lazy SMP e junta as suas estatísticas.
+
+        Args:
+            helpers (list): As tarefas devolvidas por start_helpers.
+        """
+        self.stop_flag.value = 1
+        self.worker_nodes = [self.nodes]
+        self.shared_hits = self.table.hits
+        self.shared_probes = self.table.hits + self.table.misses
+        for helper in helpers:
+            nodes, hits, probes = helper.result()
+            self.worker_nodes.append(nodes)
+            self.shared_hits += hits
+            self.shared_probes += probes
+
+    def smp_stats(self):
+        """
+        Obtém as estatísticas da última pesquisa Lazy SMP.
+
+        Returns:
+            dict: Nós por processo (o principal primeiro), total de nós e taxa de acertos na tabela partilhada.
+        """
+        return {
+            'worker_nodes': self.worker_nodes,
+            'total_nodes': sum(self.worker_nodes),
+            'shared_hits': self.shared_hits,
+            'shared_probes': self.shared_probes,
+            'shared_hit_rate': self.shared_hits / self.shared_probes if self.shared_probes else 0.0,
+        }
+
+    def search_root_parallel(self, board, moves, depth, turn, evaluation_func):
+        """
+        Pesquisa os movimentos da raiz em vários processos.
+
+        O primeiro movimento (o melhor da iteração anterior) é pesquisado
+        sozinho para estabelecer um bom Alpha; os restantes são distribuídos
+        pelos processos, que partilham o Alpha à medida que o melhoram. A
+        posição é enviada em máscaras de bits (BitBoard.pack) e não como Board.
+
+        Args:
+            board (Board): O estado atual do tabuleiro.
+            moves (list): Os movimentos legais do jogador atual, pela ordem em que são pesquisados.
+            depth (int): A profundidade da pesquisa.
+            turn (int): A cor do jogador atual.
+            evaluation_func (int): Qual função de avaliação usar (1, 2 ou 3).
 
-        board_copy = deepcopy(board)  # Cria uma cópia do tabuleiro
-        legal_pieces_copy, legal_moves_copy = board_copy.find_available_moves(turn)  # Encontra movimentos legais na cópia
+        Returns:
+            tuple: O melhor movimento encontrado e o seu valor.
+
+        Raises:
+            SearchTimeout: Se o tempo da pesquisa se esgotar.
+        """
+        pool = self.get_pool()
+        self.shared_alpha.value = float('-inf')
+        state = board.to_bitboard().pack()
+        deadline = None
+        if self.deadline is not None:
+            deadline = time.time() + (self.deadline - time.perf_counter())
+
+        def submit(move):
+            return pool.submit(search_root_move, state, move, depth, turn, evaluation_func, deadline, self.search_id)
+
+        results = [submit(moves[0]).result()]
+        if results[0][0] is not None:
+            futures = [submit(move) for move in moves[1:]]
+            try:
+                for future in futures:
+                    results.append(future.result())
+                    if results[-1][0] is None:
+                        break  # O tempo acabou: as tarefas que faltam já não interessam
+            finally:
+                for future in futures:
+                    future.cancel()  # Só tem efeito nas tarefas que ainda não começaram
+
+        best_eval = float('-inf')
+        best_move = moves[0]
+        for move, (eval, nodes) in zip(moves, results):
+            self.nodes += nodes
+            if eval is None:
+                raise SearchTimeout()
+            # Em caso de empate fica o primeiro pela ordem, como na pesquisa sequencial
+            if eval > best_eval:
+                best_eval = eval
+                best_move = move
+        return best_move, best_eval
+
+    def aspiration_search(self, board, moves, depth, turn, evaluation_func, previous_score):
+        """
+        Pesquisa a raiz com uma janela estreita à volta do valor da iteração anterior.
+
+        Se o valor cair fora da janela, a pesquisa é repetida com esse lado da
+        janela aberto.
+
+        Args:
+            board (Board): O estado atual do tabuleiro.
+            moves (list): Os movimentos legais do jogador atual, pela ordem em que são pesquisados.
+            depth (int): A profundidade da pesquisa.
+            turn (int): A cor do jogador atual.
+            evaluation_func (int): Qual função de avaliação usar (1, 2 ou 3).
+            previous_score (int): O valor da iteração anterior (None para usar a janela completa).
 
-        for i, piece in enumerate(legal_pieces_copy):
-            # Itera sobre cada peça legal
-            for move in legal_moves_copy[i]:
-                # Itera sobre cada movimento legal para a peça
-                # Efetua o movimento
-                previous_row = piece.row
-                previous_col = piece.col
-                board_copy.chessboard[piece.row][piece.col] = None  # Remove a peça da posição atual
-                piece.move(move[0], move[1], board_copy)  # Move a peça para a nova posição
+        Returns:
+            tuple: O melhor movimento e o seu valor.
+        """
+        if previous_score is None:
+            return self.search_root(board, moves, depth, turn, evaluation_func, float('-inf'), float('inf'))
+
+        alpha = previous_score - ASPIRATION_WINDOW
+        beta = previous_score + ASPIRATION_WINDOW
+        while True:
+            best_move, best_eval = self.search_root(board, moves, depth, turn, evaluation_func, alpha, beta)
+            if best_eval <= alpha:
+                alpha = float('-inf')  # Falhou por baixo: o melhor movimento não é fiável
+            elif best_eval >= beta:
+                beta = float('inf')  # Falhou por cima: falta o valor exato
+            else:
+                return best_move, best_eval
+            self.researches += 1
+
+    def search_root(self, board, moves, depth, turn, evaluation_func, alpha, beta):
+        """
+        Pesquisa todos os movimentos da raiz com uma dada profundidade.
+
+        O Alpha passa de um movimento para o seguinte, e os movimentos depois do
+        primeiro são pesquisados com uma janela nula.
+
+        Args:
+            board (Board): O estado atual do tabuleiro.
+            moves (list): Os movimentos legais do jogador atual, pela ordem em que são pesquisados.
+            depth (int): A profundidade da pesquisa.
+            turn (int): A cor do jogador atual.
+            evaluation_func (int): Qual função de avaliação usar (1, 2 ou 3).
+            alpha (float): O limite inferior da janela.
+            beta (float): O limite superior da janela.
 
-                board_copy.chessboard[piece.row][piece.col] = piece  # Atualiza a posição da peça no tabuleiro
+        Returns:
+            tuple: O melhor movimento encontrado e o seu valor.
+        """
+        best_eval = float('-inf')  # Inicializa com o menor valor possível
+        best_move = moves[0]
 
+        for index, move in enumerate(moves):
+            # Itera sobre cada movimento legal
+            undo = board.make_move(move)  # Efetua o movimento
+            try:
                 # Calcula o valor do nó filho recursivamente
-                eval = self.minimax(deepcopy(board_copy), depth - 1, True, float('-inf'), float('inf'), turn, evaluation_func)
+                if index == 0:
+                    eval = self.minimax(board, depth - 1, board.turn == turn, alpha, beta, turn, evaluation_func, 1)
+                else:
+                    eval = self.minimax(board, depth - 1, board.turn == turn, alpha, alpha + 1, turn, evaluation_func, 1)
+                    if alpha < eval < beta:
+                        eval = self.minimax(board, depth - 1, board.turn == turn, alpha, beta, turn, evaluation_func, 1)
+            finally:
+                board.unmake_move(undo)  # Desfaz o movimento (mesmo que a pesquisa seja interrompida)
 
-                # Desfaz o movimento
-                board_copy.chessboard[piece.row][piece.col] = None  # Remove a peça da nova posição
-                piece.move(previous_row, previous_col, board_copy)  # Move a peça de volta para a posição original
-                board_copy.chessboard[piece.row][piece.col] = piece  # Atualiza a posição da peça no tabuleiro
+            if eval > best_eval:
+                # Se o valor for melhor que o melhor valor encontrado até agora
+                best_eval = eval  # Atualiza o melhor valor
+                best_move = move  # Atualiza o melhor movimento
+            alpha = max(alpha, eval)  # Os movimentos seguintes só interessam se forem melhores
 
-                if eval > best_eval:
-                    # Se o valor for melhor que o melhor valor encontrado até agora
-                    best_eval = eval  # Atualiza o melhor valor
-                    best_move = move  # Atualiza o melhor movimento
-                    best_piece = legal_pieces[i]  # Atualiza a melhor peça
+            if beta <= alpha:
+                break  # Falhou por cima da janela de aspiração
+
+        return best_move, best_eval
 
-        return (best_piece.row, best_piece.col), best_move  # Retorna a posição da peça e o melhor movimento
+    def visit_node(self):
+        """
+        Conta um nó visitado e verifica periodicamente se o tempo da jogada se esgotou.
+
+        Raises:
+            SearchTimeout: Se o tempo da pesquisa tiver acabado (ou, num processo auxiliar, se a pesquisa principal terminou).
+        """
+        self.nodes += 1
+        if self.nodes % CHECK_TIME_EVERY == 0:
+            if self.deadline is not None and time.perf_counter() >= self.deadline:
+                raise SearchTimeout()
+            if self.stop_flag is not None and self.stop_flag.value:
+                raise SearchTimeout()  # Processo auxiliar do Lazy SMP: a pesquisa principal terminou
+
+    def quiescence(self, board, maximizing_player, alpha, beta, turn, evaluation_func, qply):
+        """
+        Pesquisa apenas as capturas a partir de uma folha, até a posição ficar calma.
+
+        As capturas são obrigatórias: se o jogador a jogar tiver capturas, tem
+        de escolher uma delas, pelo que todas são pesquisadas. A avaliação
+        estática (stand-pat) só é usada numa posição calma ou quando se atinge
+        o limite de capturas seguidas.
+
+        Args:
+            board (Board): O estado atual do tabuleiro.
+            maximizing_player (bool): True se o jogador a jogar for o maximizador.
+            alpha (float): O melhor valor que o jogador maximizador pode garantir até agora.
+            beta (float): O melhor valor que o jogador minimizador pode garantir até agora.
+            turn (int): A cor do jogador maximizador, do ponto de vista do qual se avalia o tabuleiro.
+            evaluation_func (int): Qual função de avaliação usar (1, 2 ou 3).
+            qply (int): O número de capturas já pesquisadas depois da folha.
+
+        Returns:
+            float: O valor heurístico da posição.
+        """
+        if qply >= self.quiescence_ply:
+            return self.evaluate_board(board, turn, evaluation_func)
+
+        captures = list(board.iter_captures(board.turn))
+        if not captures:
+            return self.evaluate_board(board, turn, evaluation_func)  # Posição calma
+        captures.sort(key=len, reverse=True)  # Mais peças capturadas primeiro
+
+        best_eval = float('-inf') if maximizing_player else float('inf')
+        for move in captures:
+            self.visit_node()
+            undo = board.make_move(move)
+            try:
+                eval = self.quiescence(board, board.turn == turn, alpha, beta, turn, evaluation_func, qply + 1)
+            finally:
+                board.unmake_move(undo)
+            if maximizing_player:
+                best_eval = max(best_eval, eval)
+                alpha = max(alpha, eval)
+            else:
+                best_eval = min(best_eval, eval)
+                beta = min(beta, eval)
+            if beta <= alpha:
+                break
+
+        return best_eval
+
+    def null_move_search(self, board, depth, maximizing_player, alpha, beta, turn, evaluation_func, ply):
+        """
+        Tenta um corte passando a vez ao adversário, com uma pesquisa reduzida e janela nula.
+
+        Args:
+            board (Board): O estado atual do tabuleiro.
+            depth (int): A profundidade restante no nó.
+            maximizing_player (bool): True se o jogador a jogar for o maximizador.
+            alpha (float): O limite inferior da janela.
+            beta (float): O limite superior da janela.
+            turn (int): A cor do jogador maximizador.
+            evaluation_func (int): Qual função de avaliação usar (1, 2 ou 3).
+            ply (int): A distância à raiz da pesquisa.
+
+        Returns:
+            float: O valor com que o nó é cortado, ou None se não houver corte.
+        """
+        # Só vale a pena tentar se a avaliação estática já estiver fora da janela
+        static_eval = self.evaluate_board(board, turn, evaluation_func)
+        if (static_eval < beta) if maximizing_player else (static_eval > alpha):
+            return None
+
+        undo = board.make_null_move()
+        try:
+            if maximizing_player:
+                eval = self.minimax(board, depth - 1 - NULL_MOVE_REDUCTION, board.turn == turn, beta - 1, beta, turn, evaluation_func, ply + 1, False)
+            else:
+                eval = self.minimax(board, depth - 1 - NULL_MOVE_REDUCTION, board.turn == turn, alpha, alpha + 1, turn, evaluation_func, ply + 1, False)
+        finally:
+            board.unmake_null_move(undo)
+
+        if (eval >= beta) if maximizing_player else (eval <= alpha):
+            self.null_cutoffs += 1
+            return eval
+        return None
+
+    def build_reduction_table(self, base, divisor):
+        """
+        Calcula a tabela de reduções dos movimentos tardios.
+
+        A redução cresce com o logaritmo da profundidade e da posição do
+        movimento na lista ordenada, e deixa sempre pelo menos um nível por pesquisar.
+
+        Args:
+            base (float): A redução base.
+            divisor (float): Quanto maior, menor a redução.
+
+        Returns:
+            list: A redução por [profundidade][posição na lista].
+        """
+        table = [[0] * REDUCTION_TABLE_SIZE for _ in range(REDUCTION_TABLE_SIZE)]
+        for depth in range(LMR_MIN_DEPTH, REDUCTION_TABLE_SIZE):
+            for index in range(LMR_MIN_INDEX, REDUCTION_TABLE_SIZE):
+                reduction = int(base + math.log(depth) * math.log(index) / divisor)
+                table[depth][index] = max(0, min(reduction, depth - 2))
+        return table
+
+    def reduction(self, depth, index):
+        """
+        Obtém a redução de profundidade de um movimento normal.
+
+        Args:
+            depth (int): A profundidade restante no nó.
+            index (int): A posição do movimento na lista ordenada.
+
+        Returns:
+            int: Quantos níveis reduzir (0 se não se reduzir).
+        """
+        if not self.late_move_reductions:
+            return 0
+        return self.reductions[min(depth, REDUCTION_TABLE_SIZE - 1)][min(index, REDUCTION_TABLE_SIZE - 1)]
+
+    def generate_moves(self, board):
+        """
+        Gera todos os movimentos legais do jogador a jogar.
+
+        Args:
+            board (Board): O estado atual do tabuleiro.
+
+        Returns:
+            tuple: A lista de movimentos e True se forem capturas (que são obrigatórias), False caso contrário.
+        """
+        captures = list(board.iter_captures(board.turn))
+        if captures:
+            return captures, True
+
+        moves = []
+        for piece in list(board.all_pieces_black if board.turn == BLACK else board.all_pieces_white):
+            moves.extend(board.iter_piece_moves(piece))
+        return moves, False
+
+    def order_moves(self, board, moves, capturing, hash_move, ply):
+        """
+        Ordena os movimentos para que os melhores sejam pesquisados primeiro (mais cortes Alpha-Beta).
+
+        A ordem é: o movimento da tabela de transposição, as capturas pelo número
+        de peças capturadas, os movimentos matadores deste ply e os restantes pelo
+        histórico de cortes.
+
+        Args:
+            board (Board): O estado atual do tabuleiro.
+            moves (list): Os movimentos legais.
+            capturing (bool): True se os movimentos forem capturas.
+            hash_move (tuple): O melhor movimento guardado na tabela de transposição (ou None).
+            ply (int): A distância à raiz da pesquisa.
+
+        Returns:
+            list: Os movimentos ordenados.
+        """
+        killers = self.killers.get(ply, ())
+        history = self.history[board.turn]
+
+        def priority(move):
+            # A tabela partilhada só guarda as casas de partida e de chegada do movimento
+            if hash_move is not None and move[0] == hash_move[0] and move[-1] == hash_move[-1]:
+                return (3, 0)
+            if capturing:
+                return (2, len(move) - 1)  # Material ganho: uma peça por salto
+            if move in killers:
+                return (1, -killers.index(move))
+            return (0, history.get((move[0], move[-1]), 0))
+
+        return sorted(moves, key=priority, reverse=True)
+
+    def record_cutoff(self, board, move, capturing, depth, ply, index):
+        """
+        Regista um corte Alpha-Beta nas estatísticas e nas heurísticas de ordenação.
+
+        Args:
+            board (Board): O estado atual do tabuleiro.
+            move (tuple): O movimento que provocou o corte.
+            capturing (bool): True se o movimento for uma captura.
+            depth (int): A profundidade restante no nó.
+            ply (int): A distância à raiz da pesquisa.
+            index (int): A posição do movimento na lista ordenada.
+        """
+        self.cutoffs += 1
+        if index == 0:
+            self.first_move_cutoffs += 1
+
+        # As capturas já são ordenadas pelo material; só os movimentos normais alimentam as heurísticas
+        if capturing:
+            return
+        killers = self.killers.setdefault(ply, [None, None])
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+        square_pair = (move[0], move[-1])
+        history = self.history[board.turn]
+        history[square_pair] = history.get(square_pair, 0) + depth * depth
+
+    def ordering_stats(self):
+        """
+        Obtém os contadores da ordenação de movimentos da última pesquisa.
+
+        Returns:
+            dict: Nós visitados, cortes, cortes no primeiro movimento e a respetiva taxa.
+        """
+        return {
+            'nodes': self.nodes,
+            'cutoffs': self.cutoffs,
+            'first_move_cutoffs': self.first_move_cutoffs,
+            'first_move_cutoff_rate': self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0,
+            'null_cutoffs': self.null_cutoffs,
+            'reduced': self.reduced,
+            'reduction_researches': self.reduction_researches,
+        }
+
+    def evaluate_board(self, board, turn, evaluation_func):
+        """
+        Avalia o tabuleiro com a função de avaliação escolhida.
+
+        Args:
+            board (Board): O estado do tabuleiro a ser avaliado.
+            turn (int): A cor do jogador do ponto de vista do qual se avalia.
+            evaluation_func (int): Qual função de avaliação usar (1, 2 ou 3).
+
+        Returns:
+            float: O valor heurístico do tabuleiro.
+        """
+        if evaluation_func == 1:
+            return self.evaluate(board, turn)
+        elif evaluation_func == 2:
+            return self.evaluate_2(board, turn)
+        elif evaluation_func == 3:
+            return self.evaluate_3(board, turn)
 
     def evaluate(self, board, turn):
         """
@@ -241,24 +1037,211 @@ class Minimax:
         return score
 
 
-class MCTSNode:
+class MCTSTree:
     """
-    Representa um nó na árvore de busca Monte Carlo Tree Search (MCTS).
+    Árvore do Monte Carlo Tree Search (MCTS) guardada em listas paralelas.
+
+    Cada nó é um índice nas listas (array) de visitas, recompensas, pai,
+    primeiro filho, irmão seguinte, movimento, jogador, estado terminal, chave
+    de Zobrist, estatísticas RAVE e prior (59 bytes por nó) em vez de um
+    objeto Python. As recompensas de um nó são do ponto de vista do jogador
+    que fez o movimento do nó, tal como o prior. Os movimentos são guardados
+    uma única vez numa tabela e os nós só guardam o seu código; o estado do
+    tabuleiro de cada nó é obtido repetindo os movimentos desde a raiz com
+    make_move.
+
+    Os movimentos ainda sem filho dos nós parcialmente expandidos também são
+    guardados como códigos, num array('i') com os priors num array('d')
+    paralelo. Com as entradas desses nós e a tabela de movimentos, uma
+    pesquisa de 3000 iterações ocupa cerca de 150 bytes por nó num tabuleiro
+    6x6 e 215 bytes por nó num 8x8 (medido com tracemalloc).
     """
 
-    def __init__(self, state, parent=None):
+    def __init__(self, moves=None, move_codes=None):
+        """
+        Inicializa uma árvore vazia.
+
+        Args:
+            moves (list): Tabela de movimentos a partilhar com outra árvore (None para criar uma nova).
+            move_codes (dict): O índice de cada movimento na tabela (partilhado com a tabela).
+        """
+        self.visits = array('i')  # Número de vezes que o nó foi visitado
+        self.reward = array('d')  # Recompensa acumulada (resultados das simulações, do ponto de vista de quem fez o movimento)
+        self.parent = array('i')  # Nó pai (-1 na raiz)
+        self.first_child = array('i')  # Primeiro filho (-1 se não tiver filhos)
+        self.next_sibling = array('i')  # Filho seguinte do mesmo pai (-1 no último)
+        self.move = array('i')  # Código do movimento que leva do pai até ao nó (-1 na raiz)
+        self.white = array('b')  # 1 se o movimento do nó foi feito pelas brancas
+        self.terminal = array('b')  # 1 se o estado do nó for terminal
+        self.key = array('Q')  # Chave de Zobrist da posição do nó (para reencontrar o nó na jogada seguinte)
+        self.expanded = array('b')  # 1 se todos os movimentos do nó já tiverem um filho
+        self.amaf_visits = array('i')  # Simulações em que o movimento do nó foi jogado depois do pai (RAVE)
+        self.amaf_reward = array('d')  # Recompensa acumulada dessas simulações (RAVE)
+        self.prior = array('d')  # Probabilidade a priori do movimento do nó
+        self.untried = {}  # (códigos, priors) dos movimentos ainda sem filho, do pior para o melhor, só dos nós que já começaram a ser expandidos
+        self.moves = [] if moves is None else moves  # Movimento de cada código
+        self.move_codes = {} if move_codes is None else move_codes  # Código de cada movimento
+
+    def __len__(self):
+        """Número de nós da árvore."""
+        return len(self.visits)
+
+    def add_node(self, parent, move, key, terminal, prior=1.0, white=False):
+        """
+        Acrescenta um nó à árvore.
+
+        Args:
+            parent (int): O nó pai (-1 para a raiz).
+            move (tuple): O movimento que leva do pai até ao nó (None na raiz).
+            key (int): A chave de Zobrist da posição do nó.
+            terminal (bool): Se o estado do nó é terminal.
+            prior (float): A probabilidade a priori do movimento.
+            white (bool): Se o movimento foi feito pelas brancas.
+
+        Returns:
+            int: O índice do novo nó.
+        """
+        node = len(self.visits)
+        code = -1 if move is None else self.move_code(move)
+
+        self.visits.append(0)
+        self.reward.append(0.0)
+        self.parent.append(parent)
+        self.first_child.append(-1)
+        self.move.append(code)
+        self.white.append(1 if white else 0)
+        self.terminal.append(1 if terminal else 0)
+        self.key.append(key)
+        self.expanded.append(0)
+        self.amaf_visits.append(0)
+        self.amaf_reward.append(0.0)
+        self.prior.append(prior)
+        if parent >= 0:
+            # O novo filho fica à cabeça da lista de filhos do pai
+            self.next_sibling.append(self.first_child[parent])
+            self.first_child[parent] = node
+        else:
+            self.next_sibling.append(-1)
+        return node
+
+    def move_code(self, move):
+        """
+        Devolve o código de um movimento, acrescentando-o à tabela se ainda não estiver lá.
+
+        Args:
+            move (tuple): O movimento.
+
+        Returns:
+            int: O índice do movimento na tabela.
         """
-        Inicializa um novo nó MCTS.
+        code = self.move_codes.get(move)
+        if code is None:
+            code = len(self.moves)
+            self.moves.append(move)
+            self.move_codes[move] = code
+        return code
+
+    def set_untried(self, node, priors):
+        """
+        Guarda os movimentos de um nó que ainda não têm filho.
 
         Args:
-            state (Board): O estado do tabuleiro associado ao nó.
-            parent (MCTSNode): O nó pai (se houver).
+            node (int): O nó.
+            priors (list): Os tuplos (prior, movimento), do menor para o maior prior.
+        """
+        self.untried[node] = (array('i', [self.move_code(move) for _, move in priors]),
+                              array('d', [prior for prior, _ in priors]))
+
+    def pop_untried(self, node):
         """
-        self.state = state  # Estado do tabuleiro
-        self.parent = parent  # Nó pai
-        self.children = []  # Lista de nós filhos
-        self.visits = 0  # Número de vezes que o nó foi visitado
-        self.reward = 0  # Recompensa acumulada (resultados das simulações)
+        Retira o movimento ainda sem filho com o maior prior.
+
+        Args:
+            node (int): O nó (tem de ter movimentos por experimentar).
+
+        Returns:
+            tuple: O movimento, o seu prior e True se era o último movimento por experimentar.
+        """
+        codes, priors = self.untried[node]
+        move = self.moves[codes.pop()]
+        prior = priors.pop()
+        if not codes:
+            del self.untried[node]
+        return move, prior, not codes
+
+    def get_move(self, node):
+        """Devolve o movimento que leva do pai até ao nó (None na raiz)."""
+        code = self.move[node]
+        return None if code < 0 else self.moves[code]
+
+    def children(self, node):
+        """
+        Percorre os filhos de um nó.
+
+        Args:
+            node (int): O nó.
+
+        Yields:
+            int: Os índices dos filhos.
+        """
+        child = self.first_child[node]
+        while child >= 0:
+            yield child
+            child = self.next_sibling[child]
+
+    def subtree(self, node):
+        """
+        Copia a subárvore de um nó para uma árvore nova, em que esse nó é a raiz (índice 0).
+
+        Os restantes nós deixam de ocupar memória quando a árvore antiga é descartada.
+
+        Args:
+            node (int): A raiz da subárvore.
+
+        Returns:
+            MCTSTree: A nova árvore (partilha a tabela de movimentos).
+        """
+        tree = MCTSTree(self.moves, self.move_codes)
+        pending = [(node, -1)]
+        while pending:
+            old, parent = pending.pop()
+            new = tree.add_node(parent, self.get_move(old) if parent >= 0 else None, self.key[old], self.terminal[old], self.prior[old], self.white[old])
+            tree.visits[new] = self.visits[old]
+            tree.reward[new] = self.reward[old]
+            tree.expanded[new] = self.expanded[old]
+            tree.amaf_visits[new] = self.amaf_visits[old]
+            tree.amaf_reward[new] = self.amaf_reward[old]
+            if old in self.untried:
+                codes, priors = self.untried[old]
+                tree.untried[new] = (array('i', codes), array('d', priors))
+            pending.extend((child, new) for child in self.children(old))
+        return tree
+
+
+def mcts_worker(state, turn, iterations, seed, deadline, options):
+    """
+    Constrói uma árvore MCTS independente num processo auxiliar.
+
+    Args:
+        state (tuple): A posição da raiz serializada com BitBoard.pack.
+        turn (int): A cor do jogador da raiz.
+        iterations (int): O número máximo de iterações desta árvore (None para não limitar).
+        seed (int): A semente dos números aleatórios (diferente em cada processo).
+        deadline (float): Instante (time.time()) em que a pesquisa tem de parar, ou None.
+        options (dict): Os restantes argumentos do MontecarloTreeSearch (exploração, limites, simulações, RAVE, priors).
+
+    Returns:
+        tuple: Para cada filho da raiz, o tuplo (movimento, visitas, recompensa), o número de iterações
+               feitas e o número de nós da árvore.
+    """
+    random.seed(seed)
+    board = Board.from_bitboard(BitBoard.unpack(state))
+    monte_carlo = MontecarloTreeSearch(iterations, **options)
+    monte_carlo.start_search(None if deadline is None else deadline - time.time())
+    root = monte_carlo.build_tree(board, turn)
+    tree = monte_carlo.tree
+    children = [(tree.get_move(child), tree.visits[child], tree.reward[child]) for child in tree.children(root)]
+    return children, monte_carlo.completed_iterations, len(tree)
 
 
 class MontecarloTreeSearch:
@@ -266,178 +1249,403 @@ class MontecarloTreeSearch:
     Implementação do algoritmo Monte Carlo Tree Search (MCTS).
     """
 
-    def __init__(self, iterations, exploration_weight=1.4):
+    def __init__(self, iterations, exploration_weight=1.4, workers=1, threads=1, reuse_tree=True, rollouts=1, time_limit=None, max_nodes=None,
+                 rollout_limit=None, rollout_evaluation=None, rave_equivalence=None, prior_evaluation=None, prior_weight=1.0,
+                 widening=None):
         """
         Inicializa o objeto MontecarloTreeSearch.
 
+        Com um limite de tempo ou de nós a pesquisa pára ao atingi-lo, e pode
+        também ser interrompida a partir de outra thread com stop(); em todos
+        os casos é escolhido o melhor filho da raiz encontrado até aí.
+
         Args:
-            iterations (int): O número de iterações para executar a busca MCTS.
-            exploration_weight (float): O peso da exploração no cálculo do UCB (Upper Confidence Bound).
+            iterations (int): O número máximo de iterações da busca MCTS (em cada processo, se houver vários).
+                              Pode ser None se houver um limite de tempo ou de nós, ou para pesquisar até stop().
+            exploration_weight (float): O peso da exploração no cálculo do UCB (Upper Confidence Bound); um valor mais alto incentiva a exploração.
+            workers (int): Número de processos, cada um com a sua árvore (1 para pesquisar só neste processo).
+            threads (int): Número de threads a construir a mesma árvore (1 para não usar threads).
+            reuse_tree (bool): Se guarda a subárvore do movimento escolhido para continuar a pesquisa na jogada seguinte.
+            rollouts (int): Número de simulações feitas em cada folha. Com mais de uma, os jogos são
+                            simulados em conjunto com NumPy (RolloutEngine), se estiver instalado.
+            time_limit (float): Tempo máximo por jogada em segundos (None para não limitar).
+            max_nodes (int): Número máximo de nós da árvore (None para não limitar).
+            rollout_limit (int): Número máximo de saltos de cada simulação, um por peça numa captura múltipla (None para jogar até ao fim).
+            rollout_evaluation (int): Função de avaliação do Minimax (1, 2 ou 3) que decide as simulações
+                                      interrompidas pelo limite (None para as contar como empates).
+            rave_equivalence (float): Número de visitas a partir do qual as estatísticas do próprio nó e as
+                                      estatísticas RAVE pesam o mesmo na seleção (None para não usar RAVE).
+            prior_evaluation (int): Função de avaliação do Minimax (1, 2 ou 3) usada para dar a cada movimento
+                                    uma probabilidade a priori, que ordena a expansão e entra na seleção
+                                    (None para expandir por ordem aleatória, com priors iguais).
+            prior_weight (float): O peso do termo dos priors na seleção (estilo PUCT).
+            widening (float): Alargamento progressivo: um nó com n visitas só considera os
+                              widening * n ** WIDENING_EXPONENT melhores movimentos (None para considerar todos).
         """
         self.iterations = iterations
         self.exploration_weight = exploration_weight
-
-    def expand(self, node):
+        self.workers = workers
+        self.pool = None  # Processos da pesquisa paralela (criados na primeira pesquisa)
+        self.root_visits = {}  # Visitas somadas de cada movimento da raiz na última pesquisa paralela
+        self.root_rewards = {}  # Recompensas somadas de cada movimento da raiz na última pesquisa paralela
+        self.threads = threads
+        self.lock = threading.Lock()  # Protege a árvore quando várias threads a constroem
+        self.started = 0  # Iterações já começadas na pesquisa atual (com várias threads)
+        self.reuse_tree = reuse_tree
+        self.tree = MCTSTree()  # A árvore da última pesquisa
+        self.root = None  # Nó do movimento escolhido na última pesquisa (a sua subárvore pode ser reaproveitada)
+        self.reused_visits = 0  # Visitas já feitas na subárvore reaproveitada pela última pesquisa
+        self.parallel_nodes = 0  # Nós somados das árvores dos processos na última pesquisa paralela
+        self.rollouts = rollouts
+        self.engine = None  # Motor das simulações em conjunto (criado na primeira simulação)
+        self.engine_weights = None  # Pesos da função de avaliação no motor das simulações em conjunto
+        self.time_limit = time_limit
+        self.max_nodes = max_nodes
+        self.deadline = None  # Instante em que a pesquisa atual tem de parar (None se não houver limite)
+        self.stop_event = threading.Event()  # Pedido de interrupção vindo de outra thread
+        self.search_root = None  # Raiz da árvore da pesquisa em curso (para best_move)
+        self.search_turn = None  # Cor do jogador da raiz, do ponto de vista do qual as simulações dão o resultado
+        self.completed_iterations = 0  # Iterações feitas na última pesquisa (somadas em todos os processos)
+        self.elapsed = 0.0  # Duração da última pesquisa em segundos
+        self.rollout_limit = rollout_limit
+        self.rollout_evaluation = rollout_evaluation
+        self.evaluator = Minimax(0, table_megabytes=0) if rollout_evaluation else None  # Só para as funções de avaliação
+        self.rave_equivalence = rave_equivalence
+        self.prior_evaluation = prior_evaluation
+        self.prior_weight = prior_weight
+        self.widening = widening
+        if prior_evaluation and self.evaluator is None:
+            self.evaluator = Minimax(0, table_megabytes=0)
+
+    def expand(self, node, board, history):
         """
         Expande um nó adicionando um novo nó filho aleatório.
 
+        Os movimentos legais do nó são gerados uma única vez, na primeira
+        expansão, por ordem aleatória (ou do melhor para o pior prior, se
+        houver priors); cada expansão retira um movimento ainda sem filho, e
+        quando se esgotam o nó fica completamente expandido.
+
         Args:
-            node (MCTSNode): O nó a ser expandido.
+            node (int): O nó a ser expandido.
+            board (Board): O tabuleiro no estado do nó (o movimento escolhido é feito nele).
+            history (list): Registos de desfazer da iteração atual (o novo movimento é acrescentado).
 
         Returns:
-            MCTSNode: O novo nó filho criado.
+            int: O novo nó filho criado (ou o próprio nó, se afinal não tiver movimentos).
         """
-        new_state = deepcopy(node.state)  # Cria uma cópia do estado atual do tabuleiro
-        new_legal_pieces, new_legal_moves = new_state.find_available_moves(new_state.turn)  # Encontra os movimentos legais no novo estado
+        tree = self.tree
+        if node not in tree.untried:
+            moves = board.get_all_moves(board.turn)
+            if not moves:
+                tree.terminal[node] = 1  # Sem movimentos: o jogador a jogar perdeu
+                return node
+            random.shuffle(moves)
+            tree.set_untried(node, self.move_priors(board, moves))
+
+        move, prior, last = tree.pop_untried(node)  # Movimento ainda sem filho com o maior prior
+        if last:
+            tree.expanded[node] = 1
+
+        # Realiza o movimento (make_move mantém o turno se ainda houver capturas disponíveis)
+        white = board.turn == WHITE
+        history.append(board.make_move(move))
+        board.check_winner()
+
+        # Cria um novo nó com o movimento, como filho do nó atual
+        return tree.add_node(node, move, board.hash, board.is_terminal, prior, white)
+
+    def move_priors(self, board, moves):
+        """
+        Calcula a probabilidade a priori de cada movimento de um nó.
 
-        # Escolhe um movimento aleatório
-        random_piece_index = random.choice(range(len(new_legal_pieces)))
-        random_piece = new_legal_pieces[random_piece_index]
-        random_move_index = random.choice(range(len(new_legal_moves[random_piece_index])))
-        random_move = new_legal_moves[random_piece_index][random_move_index]
+        Cada movimento é avaliado do ponto de vista de quem o joga com a função
+        de avaliação escolhida, e as avaliações passam por um softmax.
 
-        # Realiza o movimento no novo estado
-        new_state.chessboard[random_piece.row][random_piece.col] = None
-        random_piece.move(random_move[0], random_move[1], new_state)
-        new_state.chessboard[random_piece.row][random_piece.col] = random_piece
+        Args:
+            board (Board): O tabuleiro no estado do nó.
+            moves (list): Os movimentos legais (já baralhados, para desempatar ao acaso).
 
-        # Verifica se tem capturas
-        if random_piece.has_caught and not random_piece.king:
-            random_piece.check_catch(new_state)
-            if random_piece.legal:
-                new_state.turn = WHITE if new_state.turn == WHITE else BLACK
-            else:
-                new_state.turn = WHITE if new_state.turn == BLACK else BLACK
+        Returns:
+            list: Os tuplos (prior, movimento), do menor para o maior prior (o próximo a expandir fica no fim).
+        """
+        if not self.prior_evaluation:
+            return [(1.0 / len(moves), move) for move in moves]
+
+        player = board.turn
+        scores = []
+        for move in moves:
+            undo = board.make_move(move)
+            scores.append(self.evaluator.evaluate_board(board, player, self.prior_evaluation))
+            board.unmake_move(undo)
+
+        best = max(scores)
+        weights = [math.exp((score - best) / PRIOR_TEMPERATURE) for score in scores]
+        total = sum(weights)
+        priors = [(weight / total, move) for weight, move in zip(weights, moves)]
+        priors.sort(key=lambda entry: entry[0])  # Ordenação estável: os empates ficam na ordem aleatória
+        return priors
+
+    def can_expand(self, node):
+        """
+        Verifica se um nó ainda pode receber um filho novo.
 
-        elif random_piece.has_caught and random_piece.king:
-            random_piece.check_catch_king(new_state)
-            if random_piece.legal:
-                new_state.turn = WHITE if new_state.turn == WHITE else BLACK
-            else:
-                new_state.turn = WHITE if new_state.turn == BLACK else BLACK
+        Sem alargamento progressivo, um nó é expandido até ter todos os filhos;
+        com alargamento, o número de filhos está limitado pelas visitas do nó.
 
-        else:
-            new_state.turn = WHITE if new_state.turn == BLACK else BLACK
+        Args:
+            node (int): O nó.
 
-        if random_piece.legal and random_piece.has_caught:
-            pass # Mantém o turno se ainda houver capturas disponíveis
-        else:
-            random_piece.transform_king() # Transforma em dama se chegar ao final do tabuleiro
+        Returns:
+            bool: True se o próximo passo da descida deve expandir o nó.
+        """
+        tree = self.tree
+        if tree.expanded[node]:
+            return False
+        if self.widening is None or tree.first_child[node] < 0:
+            return True
+        allowed = max(1, int(self.widening * tree.visits[node] ** WIDENING_EXPONENT))
+        return sum(1 for _ in tree.children(node)) < allowed
+
+    def random_move(self, board):
+        """
+        Escolhe um movimento aleatório para o jogador a jogar.
 
-        new_state.check_winner()
+        Escolhe uma peça ao acaso entre as que se podem mover e depois um dos seus
+        movimentos. Sem capturas, as peças são testadas por ordem aleatória e os
+        movimentos das restantes peças não chegam a ser gerados.
 
-        new_node = MCTSNode(new_state, parent=node)  # Cria um novo nó com o novo estado
-        node.children.append(new_node)  # Adiciona o novo nó como filho do nó atual
-        return new_node
+        Args:
+            board (Board): O tabuleiro.
 
-    def select(self, node):
+        Returns:
+            tuple: O movimento ((row, col), (new_row, new_col)), ou None se não houver movimentos.
+        """
+        captures = list(board.iter_captures(board.turn))
+        if captures:
+            start = random.choice(list(dict.fromkeys(move[0] for move in captures)))  # Peça ao acaso (sem repetições)
+            return random.choice([move for move in captures if move[0] == start])
+
+        pieces = list(board.all_pieces_white if board.turn == WHITE else board.all_pieces_black)
+        random.shuffle(pieces)
+        for piece in pieces:
+            moves = list(board.iter_piece_moves(piece))
+            if moves:
+                return random.choice(moves)
+        return None
+
+    def select(self, node, board, history):
         """
         Seleciona um nó para expandir com base na política UCB (Upper Confidence Bound).
 
+        Desce pelos nós que não podem ser expandidos (todos os filhos criados,
+        ou o limite do alargamento progressivo atingido), escolhendo em cada um
+        o filho com maior pontuação UCB, sem gerar movimentos.
+
         Args:
-            node (MCTSNode): O nó a partir do qual iniciar a seleção.
+            node (int): O nó a partir do qual iniciar a seleção.
+            board (Board): O tabuleiro no estado do nó (os movimentos da descida são feitos nele).
+            history (list): Registos de desfazer da iteração atual.
 
         Returns:
-            MCTSNode: O nó selecionado para expansão.
+            int: O nó selecionado para expansão (ou um nó terminal).
         """
-        n_children = node.state.count_possible_moves()
-        if not node.children or len(node.children) < n_children:
-            return node
-
-        selected_child = max(node.children, key=lambda child: self.ucb_score(child))
-        return self.select(selected_child)
+        tree = self.tree
+        while not tree.terminal[node] and not self.can_expand(node):
+            node = max(tree.children(node), key=self.ucb_score)
+            history.append(board.make_move(tree.get_move(node)))
+        return node
 
     def ucb_score(self, node):
         """
         Calcula a pontuação UCB para um nó.
 
         Args:
-            node (MCTSNode): O nó para o qual calcular a pontuação UCB.
+            node (int): O nó para o qual calcular a pontuação UCB.
 
         Returns:
             float: A pontuação UCB do nó.
         """
-        # O fator de exploração influencia o quanto o algoritmo explora novos nós vs. explora nós já conhecidos.
-        # Um valor mais alto incentiva a exploração.
-        self.exploration_weight = 1.4  # Pode ser necessário ajustar este parâmetro para melhor desempenho
-        return node.reward / node.visits + self.exploration_weight * math.sqrt(math.log(node.parent.visits) / node.visits)
+        # O valor e o prior são ambos do ponto de vista de quem faz o movimento do nó
+        tree = self.tree
+        visits = tree.visits[node]
+        value = tree.reward[node] / visits
+        if self.rave_equivalence and tree.amaf_visits[node]:
+            # RAVE: mistura o valor do nó com o valor do movimento em todas as simulações (AMAF),
+            # com um peso que diminui à medida que o nó tem mais visitas próprias
+            beta = math.sqrt(self.rave_equivalence / (3 * visits + self.rave_equivalence))
+            value = (1 - beta) * value + beta * tree.amaf_reward[node] / tree.amaf_visits[node]
+        parent_visits = tree.visits[tree.parent[node]]
+        score = value + self.exploration_weight * math.sqrt(math.log(parent_visits) / visits)
+        if self.prior_evaluation:
+            # Termo dos priors (estilo PUCT): favorece os movimentos com melhor avaliação enquanto têm poucas visitas
+            score += self.prior_weight * tree.prior[node] * math.sqrt(parent_visits) / (1 + visits)
+        return score
 
-    def simulate(self, node, initial_turn):
+    def simulate(self, board, initial_turn, played=None):
         """
-        Simula um jogo a partir do estado do nó.
+        Simula um jogo a partir do estado atual do tabuleiro.
+
+        Os movimentos aleatórios são desfeitos no fim, deixando o tabuleiro como estava.
+        A simulação pára ao fim de rollout_limit saltos (decidida pela função de
+        avaliação, se houver) e quando uma posição se repete (empate), para não
+        ficar centenas de movimentos a mover damas de um lado para o outro. Uma
+        captura múltipla conta um salto por peça capturada, como no RolloutEngine.
 
         Args:
-            node (MCTSNode): O nó a partir do qual iniciar a simulação.
+            board (Board): O tabuleiro no estado do nó a simular.
             initial_turn (int): O turno inicial da simulação.
+            played (set): Onde guardar os movimentos jogados, como (cor, origem, destino), para o RAVE (None para não guardar).
 
         Returns:
             int: 1 se o jogador inicial venceu a simulação, -1 se perdeu, 0 se empatou.
         """
-        current_state = deepcopy(node.state)
+        history = []
+        hops = 0  # Saltos já jogados (uma captura múltipla conta um por cada peça capturada)
+        seen = set()  # Chaves de Zobrist das posições já vistas nesta simulação
+        try:
+            while True:
+
+                # O movimento aleatório também indica se o jogador a jogar ainda se pode mover
+                move = self.random_move(board)
+                winner = board.check_winner(moves=[] if move is None else [move])
+                if (winner == 'Player 1' and initial_turn == WHITE) or (winner == 'Player 2' and initial_turn == BLACK):
+                    return 1
+                elif (winner == 'Player 1' and initial_turn == BLACK) or (winner == 'Player 2' and initial_turn == WHITE):
+                    return -1
+                elif winner == 'Empate':
+                    return 0
+
+                if self.rollout_limit is not None and hops >= self.rollout_limit:
+                    return self.cutoff_score(board, initial_turn)
+                key = board.hash
+                if key in seen:
+                    return 0  # Posição repetida: conta como empate
+                seen.add(key)
+
+                if played is not None:
+                    played.add((board.turn, move[0], move[-1]))
+                # make_move mantém o turno se ainda houver capturas disponíveis
+                history.append(board.make_move(move))
+                hops += len(move) - 1
+        finally:
+            for undo in reversed(history):
+                board.unmake_move(undo)
+
+    def cutoff_score(self, board, initial_turn):
+        """
+        Decide uma simulação interrompida pelo limite de movimentos.
+
+        Args:
+            board (Board): O tabuleiro no fim da simulação.
+            initial_turn (int): O turno inicial da simulação.
 
-        winner = current_state.check_winner()
-        if (winner == 'Player 1' and initial_turn == WHITE) or (winner == 'Player 2' and initial_turn == BLACK):
-            return 1
-        elif (winner == 'Player 1' and initial_turn == BLACK) or (winner == 'Player 2' and initial_turn == WHITE):
-            return -1
-        elif winner == 'Tie':
+        Returns:
+            int: 1 se a avaliação favorece o jogador inicial, -1 se o desfavorece, 0 se for nula (ou sem avaliação).
+        """
+        if self.evaluator is None:
             return 0
+        value = self.evaluator.evaluate_board(board, initial_turn, self.rollout_evaluation)
+        return (value > 0) - (value < 0)
 
-        while True:
+    def rollout(self, board, initial_turn, played=None):
+        """
+        Faz as simulações de uma folha.
 
-            winner = current_state.check_winner()
-            if (winner == 'Player 1' and initial_turn == WHITE) or (winner == 'Player 2' and initial_turn == BLACK):
-                return 1
-            elif (winner == 'Player 1' and initial_turn == BLACK) or (winner == 'Player 2' and initial_turn == WHITE):
-                return -1
-            elif winner == 'Tie':
-                return 0
-
-            legal_pieces, legal_moves = current_state.find_available_moves(current_state.turn)
-            random_piece_index = random.choice(range(len(legal_pieces)))
-            random_piece = legal_pieces[random_piece_index]
-            random_move_index = random.choice(range(len(legal_moves[random_piece_index])))
-            random_move = legal_moves[random_piece_index][random_move_index]
-            current_state.chessboard[random_piece.row][random_piece.col] = None
-            current_piece_row = random_piece.row
-            current_piece_col = random_piece.col
-            random_piece.move(random_move[0], random_move[1], current_state)
-            current_state.chessboard[random_piece.row][random_piece.col] = random_piece
-
-            # Verifica se há outras peças para capturar
-            if not random_piece.king:
-                random_piece.check_catch(current_state)
-            else:
-                random_piece.check_catch_king(current_state)
+        Com uma simulação por folha usa simulate. Com várias, os jogos são
+        simulados em conjunto pelo RolloutEngine; sem o NumPy, são feitos um
+        a um com simulate.
 
-            if random_piece.legal and random_piece.has_caught:
-                pass # Mantém o turno se ainda houver capturas disponíveis
+        Args:
+            board (Board): O tabuleiro no estado do nó a simular.
+            initial_turn (int): O turno inicial da simulação.
+            played (set): Onde guardar os movimentos das simulações para o RAVE (só com uma simulação por folha).
 
-            else:
-                random_piece.transform_king()
-                if current_state.turn == WHITE:
-                    current_state.turn = BLACK
-                else:
-                    current_state.turn = WHITE
+        Returns:
+            tuple: A soma dos resultados (do ponto de vista do jogador inicial) e o número de simulações.
+        """
+        if self.rollouts <= 1:
+            return self.simulate(board, initial_turn, played), 1
+        if np is None:
+            return sum(self.simulate(board, initial_turn) for _ in range(self.rollouts)), self.rollouts
+
+        if self.engine is None or self.engine.size != board.size:
+            self.engine = RolloutEngine(board.size, random.getrandbits(32))
+            self.engine_weights = evaluation_weights(board.size, self.rollout_evaluation) if self.rollout_evaluation else None
+        results = self.engine.play(board.to_bitboard(), self.rollouts, self.rollout_limit, self.engine_weights)
+        results = int(results.sum())  # Do ponto de vista das brancas
+        return (results if initial_turn == WHITE else -results), self.rollouts
+
+    def add_virtual_loss(self, node, virtual_loss):
+        """
+        Marca o caminho de uma iteração em curso como uma derrota provisória (para quem fez o movimento de cada nó).
+
+        As outras threads passam a preferir caminhos diferentes até o
+        resultado da simulação ser propagado.
+
+        Args:
+            node (int): O nó onde a iteração vai simular.
+            virtual_loss (int): O número de derrotas provisórias.
+        """
+        tree = self.tree
+        while node >= 0:
+            tree.visits[node] += virtual_loss
+            tree.reward[node] -= virtual_loss
+            node = tree.parent[node]
 
-    def backpropagate(self, node, result):
+    def backpropagate(self, node, result, virtual_loss=0, visits=1):
         """
         Atualiza as estatísticas do nó com o resultado da simulação e propaga para os nós pais.
 
         Args:
-            node (MCTSNode): O nó a ser atualizado.
-            result (int): O resultado da simulação (1, -1 ou 0).
+            node (int): O nó a ser atualizado.
+            result (int): O resultado da simulação (1, -1 ou 0) do ponto de vista do jogador da raiz,
+                          ou a soma dos resultados de várias simulações.
+            virtual_loss (int): A perda virtual aplicada ao caminho na seleção, que é agora retirada.
+            visits (int): O número de simulações cujo resultado é propagado.
+        """
+        # Sobe iterativamente até à raiz (uma árvore profunda não esgota o limite de recursão)
+        tree = self.tree
+        root_white = 1 if self.search_turn == WHITE else 0
+        while node >= 0:
+            tree.visits[node] += visits - virtual_loss  # Incrementa o número de visitas (a visita provisória já foi contada)
+            # Adiciona a recompensa do ponto de vista de quem fez o movimento (e retira a derrota provisória)
+            tree.reward[node] += (result if tree.white[node] == root_white else -result) + virtual_loss
+            node = tree.parent[node]
+
+    def update_amaf(self, node, history, played, result, visits=1):
+        """
+        Atualiza as estatísticas RAVE (all-moves-as-first) dos nós do caminho de uma iteração.
+
+        Em cada nó do caminho, os filhos cujo movimento foi jogado mais abaixo
+        na árvore ou na simulação pelo mesmo jogador (com a mesma origem e
+        destino) recebem o resultado, como se esse movimento tivesse sido jogado logo ali.
+
+        Args:
+            node (int): O nó onde a simulação começou.
+            history (list): Os registos de desfazer da descida (um por ramo do caminho).
+            played (set): Os movimentos da simulação, como (cor, origem, destino).
+            result (int): O resultado da simulação do ponto de vista do jogador da raiz (ou a soma dos resultados de várias).
+            visits (int): O número de simulações.
         """
-        node.visits += 1  # Incrementa o número de visitas
-        node.reward += result  # Adiciona a recompensa
-        if node.parent:
-            # node.parent.backpropagate(result)
-            self.backpropagate(node.parent, result)  # Propaga a atualização para o nó pai
+        tree = self.tree
+        for undo in reversed(history):
+            move = tree.get_move(node)
+            played.add((undo['turn'], move[0], move[-1]))  # O turno antes do movimento é o do jogador no nó pai
+            node = tree.parent[node]
+            for child in tree.children(node):
+                child_move = tree.get_move(child)
+                if (undo['turn'], child_move[0], child_move[-1]) in played:
+                    tree.amaf_visits[child] += visits
+                    tree.amaf_reward[child] += result if undo['turn'] == self.search_turn else -result
 
     def mcts(self, root_state, turn):
         """
         Executa o algoritmo MCTS para determinar o melhor movimento.
 
+        Com vários processos, cada um constrói uma árvore independente e as
+        visitas e recompensas dos filhos da raiz são somadas antes da escolha.
+
         Args:
             root_state (Board): O estado inicial do tabuleiro.
             turn (int): A cor do jogador atual.
@@ -445,31 +1653,308 @@ class MontecarloTreeSearch:
         Returns:
             tuple: Uma tupla que contem a posição da peça e o movimento a ser realizado.
         """
+        start_time = self.start_search(self.time_limit)
+        if self.workers > 1:
+            move = self.mcts_parallel(root_state, turn)
+            self.elapsed = time.perf_counter() - start_time
+            return move
+
+        root_state.turn = turn
+        root = self.find_root(root_state) if self.reuse_tree else None
+        root = self.build_tree(root_state, turn, root)
+        self.elapsed = time.perf_counter() - start_time
+
+        # Seleciona o nó filho com o maior número de visitas
+        best_child = max(self.tree.children(root), key=lambda child: self.tree.visits[child])
+        if self.reuse_tree:
+            self.root = best_child  # A resposta do adversário estará entre os filhos deste nó
+        return self.tree.get_move(best_child)  # Retorna a posição da peça e o melhor movimento encontrado
+
+    def start_search(self, time_limit):
+        """
+        Prepara uma nova pesquisa: limpa o pedido de interrupção e marca o prazo.
+
+        Args:
+            time_limit (float): Tempo máximo da pesquisa em segundos (None para não limitar).
+
+        Returns:
+            float: O instante de início da pesquisa (time.perf_counter()).
+        """
+        start_time = time.perf_counter()
+        self.stop_event.clear()
+        self.search_root = None
+        self.deadline = None if time_limit is None else start_time + time_limit
+        self.completed_iterations = 0
+        return start_time
+
+    def stop(self):
+        """
+        Interrompe a pesquisa em curso (pode ser chamado de outra thread).
+
+        A pesquisa termina no fim da iteração atual e mcts devolve o melhor
+        movimento encontrado até aí. Com vários processos, cada árvore só
+        respeita o limite de tempo e de nós.
+        """
+        self.stop_event.set()
+
+    def should_stop(self, iterations):
+        """
+        Verifica se a pesquisa atual deve terminar.
+
+        É feita sempre pelo menos uma iteração, para a raiz ter um filho para escolher.
+
+        Args:
+            iterations (int): As iterações já feitas (ou começadas) na pesquisa atual.
+
+        Returns:
+            bool: True se foi pedida uma interrupção ou se algum dos limites foi atingido.
+        """
+        if iterations == 0:
+            return False
+        if self.stop_event.is_set():
+            return True
+        if self.iterations is not None and iterations >= self.iterations:
+            return True
+        if self.max_nodes is not None and len(self.tree) >= self.max_nodes:
+            return True
+        return self.deadline is not None and time.perf_counter() >= self.deadline
+
+    def best_move(self):
+        """
+        Obtém o melhor movimento da pesquisa em curso (ou da última), sem a interromper.
+
+        Returns:
+            tuple: O movimento do filho da raiz com mais visitas, ou None se a raiz ainda não tiver filhos.
+        """
+        with self.lock:
+            tree, root = self.tree, self.search_root
+            if root is None or root >= len(tree):
+                return None
+            children = list(tree.children(root))
+            if not children:
+                return None
+            return tree.get_move(max(children, key=lambda child: tree.visits[child]))
+
+    def search_stats(self):
+        """
+        Obtém os contadores da última pesquisa, para ajustar os limites a cada tamanho de tabuleiro.
+
+        Returns:
+            dict: Iterações feitas, simulações, nós da árvore (somados nos processos), duração e iterações por segundo.
+        """
+        return {
+            'iterations': self.completed_iterations,
+            'simulations': self.completed_iterations * max(1, self.rollouts),
+            'nodes': self.parallel_nodes if self.workers > 1 else len(self.tree),
+            'reused_visits': self.reused_visits,
+            'seconds': self.elapsed,
+            'iterations_per_second': self.completed_iterations / self.elapsed if self.elapsed else 0.0,
+        }
+
+    def find_root(self, board):
+        """
+        Procura na árvore da jogada anterior o nó da posição atual.
+
+        A posição atual resulta do movimento escolhido na última pesquisa e da
+        resposta do adversário, pelo que é um dos filhos do nó desse movimento
+        (identificado pela chave de Zobrist). A sua subárvore passa para uma
+        árvore nova e os restantes ramos são descartados.
+
+        Args:
+            board (Board): O tabuleiro na posição atual.
+
+        Returns:
+            int: A raiz da nova árvore, ou None se a posição não existir na árvore anterior.
+        """
+        previous, self.root = self.root, None
+        self.reused_visits = 0
+        if previous is None:
+            return None
+
+        tree = self.tree
+        key = board.hash
+        candidates = [previous] if tree.key[previous] == key else []
+        candidates += [child for child in tree.children(previous) if tree.key[child] == key]
+        if not candidates:
+            return None
+
+        node = max(candidates, key=lambda child: tree.visits[child])
+        self.tree = tree.subtree(node)
+        self.reused_visits = self.tree.visits[0]
+        return 0
+
+    def mcts_parallel(self, root_state, turn):
+        """
+        Executa árvores MCTS independentes em vários processos e junta as estatísticas da raiz.
+
+        A posição é enviada em máscaras de bits (BitBoard.pack) e cada processo
+        usa uma semente diferente.
+
+        Args:
+            root_state (Board): O estado inicial do tabuleiro.
+            turn (int): A cor do jogador atual.
+
+        Returns:
+            tuple: O movimento com mais visitas somadas em todas as árvores.
+        """
+        if self.pool is None:
+            self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        root_state.turn = turn
+        state = root_state.to_bitboard().pack()
+        # O prazo vai em tempo de relógio, comum a todos os processos
+        deadline = None if self.deadline is None else time.time() + (self.deadline - time.perf_counter())
+        options = {
+            'exploration_weight': self.exploration_weight,
+            'max_nodes': self.max_nodes,
+            'rollouts': self.rollouts,
+            'rollout_limit': self.rollout_limit,
+            'rollout_evaluation': self.rollout_evaluation,
+            'rave_equivalence': self.rave_equivalence,
+            'prior_evaluation': self.prior_evaluation,
+            'prior_weight': self.prior_weight,
+            'widening': self.widening,
+        }
+        futures = [self.pool.submit(mcts_worker, state, turn, self.iterations, random.getrandbits(32), deadline, options)
+                   for _ in range(self.workers)]
+
+        # Junta as visitas e as recompensas de cada movimento da raiz (pela ordem em que aparecem)
+        visits = {}
+        rewards = {}
+        self.parallel_nodes = 0
+        self.reused_visits = 0  # As árvores dos processos nunca são reaproveitadas
+        for future in futures:
+            children, iterations, nodes = future.result()
+            self.completed_iterations += iterations
+            self.parallel_nodes += nodes
+            for move, child_visits, child_reward in children:
+                visits[move] = visits.get(move, 0) + child_visits
+                rewards[move] = rewards.get(move, 0) + child_reward
+        self.root_visits = visits
+        self.root_rewards = rewards
+        return max(visits, key=visits.get)
+
+    def close(self):
+        """Termina os processos da pesquisa paralela (se existirem)."""
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+    def build_tree(self, root_state, turn, root=None):
+        """
+        Executa as iterações do MCTS e devolve a árvore construída.
+
+        Cada iteração faz os movimentos da árvore diretamente no tabuleiro recebido
+        e desfá-los no fim, pelo que o tabuleiro não é copiado.
+
+        Args:
+            root_state (Board): O estado inicial do tabuleiro.
+            turn (int): A cor do jogador atual.
+            root (int): A raiz de self.tree, se a árvore já existente for para esta posição (None para começar do zero).
+
+        Returns:
+            int: A raiz da árvore (em self.tree).
+        """
         root_state.turn = turn  # Associa o turno ao estado raiz
-        root = MCTSNode(root_state)  # Cria o nó raiz
-        for _ in range(self.iterations):
-            node = root
-
-            # Fase de Seleção
-            while not node.state.is_terminal:  # Enquanto o estado não for terminal
-                n_children = node.state.count_possible_moves()
-                if len(node.children) < n_children:
-                    # Expandir
-                    node = self.expand(node)  # Expande o nó
-                    break
-                else:  # Expansão Máxima
-                    # Seleção
-                    # print('Init')
-                    node = self.select(node)  # Seleciona o próximo nó
-                    # print('End')
+        self.search_turn = turn
+        if root is None:
+            self.tree = MCTSTree(self.tree.moves, self.tree.move_codes)  # Os movimentos conhecidos continuam válidos
+            root = self.tree.add_node(-1, None, root_state.hash, False)  # Cria o nó raiz
+        self.search_root = root
+        if self.threads > 1:
+            self.build_tree_threaded(root, root_state, turn)
+            return root
+
+        # Itera até ao número de iterações, ao limite de tempo ou de nós, ou a um pedido de interrupção
+        while not self.should_stop(self.completed_iterations):
+            # Fase de Seleção e Expansão
+            node, history = self.descend(root, root_state)
 
             # Fase de Simulação
-            reward = self.simulate(node, turn)  # Simula um jogo a partir do nó
+            played = set() if self.rave_equivalence else None  # Movimentos da simulação (para o RAVE)
+            reward, visits = self.rollout(root_state, turn, played)  # Simula um ou mais jogos a partir do nó
+
+            # Repõe o tabuleiro no estado da raiz
+            for undo in reversed(history):
+                root_state.unmake_move(undo)
 
             # Fase de Retropropagação
-            self.backpropagate(node, reward)  # Atualiza as estatísticas dos nós
+            self.backpropagate(node, reward, visits=visits)  # Atualiza as estatísticas dos nós
+            if played is not None:
+                self.update_amaf(node, history, played, reward, visits)
+            self.completed_iterations += 1
 
-        # Seleciona o nó filho com o maior número de visitas
-        best_piece_pos = max(root.children, key=lambda child: child.visits).state.last_moved_piece.previous_position
-        best_move = max(root.children, key=lambda child: child.visits).state.last_move
-        return best_piece_pos, best_move  # Retorna a posição da peça e o melhor movimento encontrado
\ No newline at end of file
+        return root
+
+    def descend(self, root, board):
+        """
+        Desce na árvore a partir da raiz até expandir um nó novo ou chegar a um estado terminal.
+
+        Args:
+            root (int): A raiz da árvore.
+            board (Board): O tabuleiro no estado da raiz (os movimentos da descida são feitos nele).
+
+        Returns:
+            tuple: O nó onde simular e os registos de desfazer dos movimentos feitos.
+        """
+        node = root
+        history = []  # Registos de desfazer dos movimentos feitos nesta iteração
+        while not self.tree.terminal[node]:  # Enquanto o estado não for terminal
+            if self.can_expand(node):
+                # Expandir
+                node = self.expand(node, board, history)  # Expande o nó
+                break
+            else:  # Expansão Máxima
+                # Seleção
+                node = self.select(node, board, history)  # Seleciona o próximo nó
+        return node, history
+
+    def build_tree_threaded(self, root, root_state, turn):
+        """
+        Constrói a mesma árvore com várias threads (paralelismo na árvore).
+
+        Cada thread tem o seu tabuleiro. A descida e a retropropagação são feitas
+        com a árvore trancada; as simulações, que são a parte mais demorada,
+        correm em simultâneo (em CPython sem GIL). A perda virtual afasta as
+        threads dos caminhos que estão a ser simulados.
+
+        Args:
+            root (int): A raiz da árvore.
+            root_state (Board): O estado inicial do tabuleiro.
+            turn (int): A cor do jogador atual.
+        """
+        self.started = 0
+        state = root_state.to_bitboard()
+        threads = [threading.Thread(target=self.tree_worker, args=(root, Board.from_bitboard(state), turn))
+                   for _ in range(self.threads)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def tree_worker(self, root, board, turn):
+        """
+        Executa iterações numa thread até a pesquisa atingir um dos seus limites.
+
+        Args:
+            root (int): A raiz da árvore partilhada.
+            board (Board): O tabuleiro desta thread, no estado da raiz.
+            turn (int): A cor do jogador atual.
+        """
+        while True:
+            with self.lock:
+                if self.should_stop(self.started):
+                    return
+                self.started += 1
+                node, history = self.descend(root, board)
+                self.add_virtual_loss(node, VIRTUAL_LOSS)
+
+            played = set() if self.rave_equivalence else None
+            reward, visits = self.rollout(board, turn, played)
+            for undo in reversed(history):
+                board.unmake_move(undo)
+
+            with self.lock:
+                self.backpropagate(node, reward, VIRTUAL_LOSS, visits)
+                if played is not None:
+                    self.update_amaf(node, history, played, reward, visits)
+                self.completed_iterations += 1
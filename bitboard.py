@@ -0,0 +1,451 @@
+from vars import *
+from zobrist import zobrist_keys
+
+_tables = {}  # Tabelas pré-calculadas para cada tamanho de tabuleiro
+
+
+def board_tables(size):
+    """
+    Obtém as tabelas pré-calculadas para um tamanho de tabuleiro.
+
+    Args:
+        size (int): O tamanho do tabuleiro.
+
+    Returns:
+        dict: Máscara completa, máscaras das colunas das extremidades e raios
+              (lista de casas em cada direção) para cada casa.
+    """
+    if size not in _tables:
+        full = (1 << (size * size)) - 1
+        first_col = 0
+        last_col = 0
+        for row in range(size):
+            first_col |= 1 << (row * size)
+            last_col |= 1 << (row * size + size - 1)
+
+        rays = {}
+        for row in range(size):
+            for col in range(size):
+                for dr, dc in ALL_DIRECTIONS:
+                    ray = []
+                    r, c = row + dr, col + dc
+                    while 0 <= r < size and 0 <= c < size:
+                        ray.append(r * size + c)
+                        r, c = r + dr, c + dc
+                    rays[(row * size + col, dr, dc)] = ray
+
+        _tables[size] = {'full': full, 'first_col': first_col, 'last_col': last_col, 'rays': rays}
+    return _tables[size]
+
+
+def iter_bits(bits):
+    """Itera sobre os índices dos bits ativos de uma máscara (do menor para o maior)."""
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+class BitBoard:
+    """
+    Representação compacta de uma posição do Dameo em máscaras de bits.
+
+    Cada lado guarda as peças normais e as damas num inteiro, em que o bit
+    row * size + col corresponde à casa (row, col). A geração de movimentos,
+    a deteção de capturas e a verificação do vencedor são feitas com
+    deslocamentos e máscaras em vez de percorrer listas de peças.
+    """
+
+    def __init__(self, size, white_men=0, white_kings=0, black_men=0, black_kings=0, turn=WHITE, moves_whitout_catching=0, capturing_square=None):
+        """
+        Inicializa a posição.
+
+        Args:
+            size (int): O tamanho do tabuleiro (5 a 8).
+            white_men (int): Máscara das peças brancas normais.
+            white_kings (int): Máscara das damas brancas.
+            black_men (int): Máscara das peças pretas normais.
+            black_kings (int): Máscara das damas pretas.
+            turn (tuple): A cor do jogador atual (WHITE ou BLACK).
+            moves_whitout_catching (int): Contador de movimentos sem capturas.
+            capturing_square (int): Casa da peça que está a meio de uma captura múltipla, ou None.
+        """
+        self.size = size
+        self.white_men = white_men
+        self.white_kings = white_kings
+        self.black_men = black_men
+        self.black_kings = black_kings
+        self.turn = turn
+        self.moves_whitout_catching = moves_whitout_catching
+        self.capturing_square = capturing_square
+        self.tables = board_tables(size)
+
+
+    def copy(self):
+        """Devolve uma cópia independente da posição."""
+        return BitBoard(self.size, self.white_men, self.white_kings, self.black_men, self.black_kings,
+                        self.turn, self.moves_whitout_catching, self.capturing_square)
+
+
+    def pack(self):
+        """
+        Serializa a posição num tuplo de inteiros (por exemplo, para enviar a outro processo).
+
+        Returns:
+            tuple: (size, white_men, white_kings, black_men, black_kings, turn, moves_whitout_catching, capturing_square),
+                   com o turno 0 para as brancas e 1 para as pretas e a casa -1 se não houver captura a meio.
+        """
+        return (self.size, self.white_men, self.white_kings, self.black_men, self.black_kings,
+                0 if self.turn == WHITE else 1, self.moves_whitout_catching,
+                -1 if self.capturing_square is None else self.capturing_square)
+
+
+    @classmethod
+    def unpack(cls, state):
+        """
+        Reconstrói uma posição serializada com pack.
+
+        Args:
+            state (tuple): O tuplo devolvido por pack.
+
+        Returns:
+            BitBoard: A posição correspondente.
+        """
+        size, white_men, white_kings, black_men, black_kings, turn, moves_whitout_catching, capturing_square = state
+        return cls(size, white_men, white_kings, black_men, black_kings, WHITE if turn == 0 else BLACK,
+                   moves_whitout_catching, None if capturing_square < 0 else capturing_square)
+
+
+    def zobrist_hash(self):
+        """
+        Calcula a chave de Zobrist da posição (igual a Board.hash para a mesma posição).
+
+        Returns:
+            int: A chave de 64 bits.
+        """
+        keys = zobrist_keys(self.size)
+        value = keys['turn'] if self.turn == BLACK else 0
+        for color in (WHITE, BLACK):
+            for king, bits in ((False, self.men(color)), (True, self.kings(color))):
+                table = keys['pieces'][(color, king)]
+                for square in iter_bits(bits):
+                    row, col = self.position(square)
+                    value ^= table[row][col]
+        return value
+
+
+    def square(self, row, col):
+        """Converte uma posição (row, col) no índice do bit correspondente."""
+        return row * self.size + col
+
+
+    def position(self, square):
+        """Converte o índice de um bit na posição (row, col)."""
+        return divmod(square, self.size)
+
+
+    def pieces(self, color):
+        """Máscara de todas as peças de uma cor."""
+        if color == WHITE:
+            return self.white_men | self.white_kings
+        return self.black_men | self.black_kings
+
+
+    def men(self, color):
+        """Máscara das peças normais de uma cor."""
+        return self.white_men if color == WHITE else self.black_men
+
+
+    def kings(self, color):
+        """Máscara das damas de uma cor."""
+        return self.white_kings if color == WHITE else self.black_kings
+
+
+    def empty(self):
+        """Máscara das casas livres."""
+        return self.tables['full'] & ~(self.white_men | self.white_kings | self.black_men | self.black_kings)
+
+
+    def count(self, color):
+        """Número de peças de uma cor."""
+        return bin(self.pieces(color)).count('1')
+
+
+    def shift(self, bits, dr, dc):
+        """
+        Desloca todas as casas de uma máscara uma casa na direção (dr, dc).
+
+        As casas que sairiam do tabuleiro são descartadas.
+        """
+        if dc == 1:
+            bits &= ~self.tables['last_col']
+        elif dc == -1:
+            bits &= ~self.tables['first_col']
+        offset = dr * self.size + dc
+        if offset > 0:
+            return (bits << offset) & self.tables['full']
+        return bits >> -offset
+
+
+    def forward(self, color):
+        """Direção (linha) em que as peças normais de uma cor andam."""
+        return -1 if color == WHITE else 1
+
+
+    def can_capture(self, color):
+        """
+        Verifica, com operações sobre máscaras, se alguma peça de uma cor pode capturar.
+
+        Args:
+            color (tuple): A cor do jogador (WHITE ou BLACK).
+
+        Returns:
+            bool: True se existir pelo menos uma captura.
+        """
+        enemy = self.pieces(WHITE if color == BLACK else BLACK)
+        empty = self.empty()
+
+        if self.capturing_square is not None and self.pieces(color) >> self.capturing_square & 1:
+            return bool(self.piece_captures(self.capturing_square))
+
+        men = self.men(color)
+        kings = self.kings(color)
+        for dr, dc in ORTHOGONAL:
+            # Peças normais: adversário adjacente e casa livre a seguir
+            if self.shift(self.shift(men, dr, dc) & enemy, dr, dc) & empty:
+                return True
+            # Damas: avançam pelas casas livres até encontrarem uma peça
+            ray = self.shift(kings, dr, dc)
+            while ray:
+                if self.shift(ray & enemy, dr, dc) & empty:
+                    return True
+                ray = self.shift(ray & empty, dr, dc)
+        return False
+
+
+    def has_moves(self, color):
+        """
+        Verifica, com operações sobre máscaras, se uma cor tem algum movimento legal.
+
+        Args:
+            color (tuple): A cor do jogador (WHITE ou BLACK).
+
+        Returns:
+            bool: True se existir pelo menos um movimento (captura ou normal).
+        """
+        if self.can_capture(color):
+            return True
+
+        own = self.pieces(color)
+        empty = self.empty()
+        forward = self.forward(color)
+
+        # Peças normais: deslizam sobre peças da mesma cor até à primeira casa livre
+        men = self.men(color)
+        for dc in (-1, 0, 1):
+            ray = self.shift(men, forward, dc)
+            while ray:
+                if ray & empty:
+                    return True
+                ray = self.shift(ray & own, forward, dc)
+
+        # Damas: basta uma casa adjacente livre
+        kings = self.kings(color)
+        for dr, dc in ALL_DIRECTIONS:
+            if self.shift(kings, dr, dc) & empty:
+                return True
+        return False
+
+
+    def piece_captures(self, square):
+        """
+        Calcula as casas onde a peça numa casa pode aterrar capturando.
+
+        Args:
+            square (int): A casa da peça.
+
+        Returns:
+            list: Lista de casas de aterragem.
+        """
+        rays = self.tables['rays']
+        if self.white_men >> square & 1 or self.white_kings >> square & 1:
+            own, king = WHITE, bool(self.white_kings >> square & 1)
+        else:
+            own, king = BLACK, bool(self.black_kings >> square & 1)
+        enemy = self.pieces(WHITE if own == BLACK else BLACK)
+        empty = self.empty()
+
+        landing = []
+        for dr, dc in ORTHOGONAL:
+            ray = rays[(square, dr, dc)]
+            if not king:
+                # Peça normal: adversário adjacente e casa livre a seguir
+                if len(ray) >= 2 and enemy >> ray[0] & 1 and empty >> ray[1] & 1:
+                    landing.append(ray[1])
+                continue
+
+            # Dama: ignora casas livres, salta a primeira peça adversária e pode aterrar em qualquer casa livre seguinte
+            i = 0
+            while i < len(ray) and empty >> ray[i] & 1:
+                i += 1
+            if i + 1 < len(ray) and enemy >> ray[i] & 1 and empty >> ray[i + 1] & 1:
+                i += 1
+                while i < len(ray) and empty >> ray[i] & 1:
+                    landing.append(ray[i])
+                    i += 1
+        return landing
+
+
+    def piece_moves(self, square):
+        """
+        Calcula as casas para onde a peça numa casa se pode mover sem capturar.
+
+        Args:
+            square (int): A casa da peça.
+
+        Returns:
+            list: Lista de casas de destino.
+        """
+        rays = self.tables['rays']
+        color = WHITE if (self.white_men | self.white_kings) >> square & 1 else BLACK
+        own = self.pieces(color)
+        empty = self.empty()
+
+        moves = []
+        if self.kings(color) >> square & 1:
+            # Dama: desliza em qualquer direção enquanto as casas estiverem livres
+            for dr, dc in ALL_DIRECTIONS:
+                for target in rays[(square, dr, dc)]:
+                    if not empty >> target & 1:
+                        break
+                    moves.append(target)
+        else:
+            # Peça normal: para a frente (em linha ou diagonal), saltando peças da mesma cor
+            forward = self.forward(color)
+            for dc in (0, 1, -1):
+                for target in rays[(square, forward, dc)]:
+                    if own >> target & 1:
+                        continue
+                    if empty >> target & 1:
+                        moves.append(target)
+                    break
+        return moves
+
+
+    def find_available_moves(self, turn):
+        """
+        Encontra os movimentos disponíveis para um determinado jogador.
+
+        Segue as mesmas regras que Board.find_available_moves: se houver capturas,
+        apenas as capturas são devolvidas (captura obrigatória).
+
+        Args:
+            turn (tuple): A cor do jogador (WHITE ou BLACK).
+
+        Returns:
+            tuple: Uma tupla contendo duas listas:
+                - A primeira lista contém as posições das peças que podem mover-se.
+                - A segunda lista contém os movimentos legais para cada peça.
+        """
+        legal_pieces = []
+        legal_moves = []
+
+        if self.can_capture(turn):
+            if self.capturing_square is not None and self.pieces(turn) >> self.capturing_square & 1:
+                squares = [self.capturing_square]
+            else:
+                squares = iter_bits(self.pieces(turn))
+            generate = self.piece_captures
+        else:
+            squares = iter_bits(self.pieces(turn))
+            generate = self.piece_moves
+
+        for square in squares:
+            targets = generate(square)
+            if targets:
+                legal_pieces.append(self.position(square))
+                legal_moves.append([self.position(target) for target in targets])
+        return legal_pieces, legal_moves
+
+
+    def move(self, start, end):
+        """
+        Executa um movimento (uma casa de partida e uma de chegada).
+
+        Remove as peças capturadas, mantém o turno se a peça puder continuar
+        a capturar e, caso contrário, promove a peça a dama e passa o turno.
+
+        Args:
+            start (tuple): A posição (row, col) da peça.
+            end (tuple): A posição (row, col) de destino.
+        """
+        source = self.square(*start)
+        target = self.square(*end)
+        color = WHITE if (self.white_men | self.white_kings) >> source & 1 else BLACK
+        enemy_color = BLACK if color == WHITE else WHITE
+        bit_source = 1 << source
+        bit_target = 1 << target
+
+        # Move a peça
+        is_king = bool(self.kings(color) & bit_source)
+        if color == WHITE:
+            if is_king:
+                self.white_kings ^= bit_source | bit_target
+            else:
+                self.white_men ^= bit_source | bit_target
+        else:
+            if is_king:
+                self.black_kings ^= bit_source | bit_target
+            else:
+                self.black_men ^= bit_source | bit_target
+
+        # Remove as peças adversárias no caminho (apenas movimentos em linha/coluna capturam)
+        captured = 0
+        if start[0] == end[0] or start[1] == end[1]:
+            dr = (end[0] > start[0]) - (end[0] < start[0])
+            dc = (end[1] > start[1]) - (end[1] < start[1])
+            for square in self.tables['rays'][(source, dr, dc)]:
+                if square == target:
+                    break
+                captured |= 1 << square
+            captured &= self.pieces(enemy_color)
+        if enemy_color == WHITE:
+            self.white_men &= ~captured
+            self.white_kings &= ~captured
+        else:
+            self.black_men &= ~captured
+            self.black_kings &= ~captured
+
+        self.moves_whitout_catching = 0 if captured else self.moves_whitout_catching + 1
+
+        # Captura múltipla: a mesma peça continua a jogar
+        if captured and self.piece_captures(target):
+            self.capturing_square = target
+            return
+
+        # Promoção a dama no fim do movimento
+        self.capturing_square = None
+        if not is_king and end[0] == (0 if color == WHITE else self.size - 1):
+            if color == WHITE:
+                self.white_men ^= bit_target
+                self.white_kings |= bit_target
+            else:
+                self.black_men ^= bit_target
+                self.black_kings |= bit_target
+        self.turn = enemy_color
+
+
+    def check_winner(self):
+        """
+        Verifica se há um vencedor.
+
+        Returns:
+            str: "Player 1", "Player 2", "Empate" ou None se o jogo continuar.
+        """
+        if not self.pieces(BLACK) or (self.turn == BLACK and not self.has_moves(BLACK)):
+            return "Player 1"
+        elif not self.pieces(WHITE) or (self.turn == WHITE and not self.has_moves(WHITE)):
+            return "Player 2"
+
+        if self.moves_whitout_catching == self.size * 7:
+            return "Empate"
@@ -1,6 +1,8 @@
 import pygame
 import sys
 from piece import Piece
+from bitboard import BitBoard, iter_bits
+from zobrist import zobrist_keys
 from vars import *
 
 class Board:
@@ -25,11 +27,17 @@ class Board:
         self.chessboard = [[None for i in range(self.size)] for j in range(self.size)]  # Matriz representando o tabuleiro
         self.all_pieces_white = []  # Lista para armazenar as peças brancas
         self.all_pieces_black = []  # Lista para armazenar as peças pretas
+        self.white_squares = set()  # Casas ocupadas pelas peças brancas
+        self.black_squares = set()  # Casas ocupadas pelas peças pretas
         self.last_moved_piece = None  # A última peça que foi movida
         self.last_move = ()  # O último movimento realizado
         self.is_terminal = False  # Flag para indicar se o jogo terminou
         self.turn = None  # A cor do jogador atual (WHITE ou BLACK)
         self.moves_whitout_catching = 0  # Contador de movimentos sem capturas
+        self.version = 0  # Contador de alterações das casas (para saber quando a posição muda)
+        self.status_cache = None  # Último resultado de check_winner e a posição a que corresponde
+        self.zobrist = zobrist_keys(size)  # Chaves de Zobrist para este tamanho de tabuleiro
+        self.pieces_hash = 0  # Chave de Zobrist das peças, atualizada a cada alteração das casas
 
 
     def change_size(self, size):
@@ -42,6 +50,10 @@ class Board:
         self.size = size
         self.square_size = int(min(width, height)/size)
         self.chessboard = [[None for i in range(self.size)] for j in range(self.size)]
+        self.white_squares = set()
+        self.black_squares = set()
+        self.zobrist = zobrist_keys(size)
+        self.pieces_hash = 0
 
 
     def start_game(self, gui, screen):
@@ -69,6 +81,9 @@ class Board:
         # Limpa as listas de peças (para reiniciar o jogo)
         self.all_pieces_white = []
         self.all_pieces_black = []
+        self.white_squares = set()
+        self.black_squares = set()
+        self.pieces_hash = 0
 
         # Peças para tabuleiros de tamanho 6 ou maior
         if self.size>=6:
@@ -81,7 +96,7 @@ class Board:
                     else:
                         piece = Piece(self.size, row, col, WHITE)  # Cria uma nova peça branca
                         self.all_pieces_white.append(piece)  # Adiciona a peça à lista de peças brancas
-                        self.chessboard[row][col] = piece  # Coloca a peça na matriz do tabuleiro
+                        self.place_piece(piece)  # Coloca a peça na matriz do tabuleiro
 
             # Inicializa as peças pretas
             for row in range (3):
@@ -92,7 +107,7 @@ class Board:
                     else:
                         piece = Piece(self.size, row, col, BLACK)  # Cria uma nova peça preta
                         self.all_pieces_black.append(piece)  # Adiciona a peça à lista de peças pretas
-                        self.chessboard[row][col] = piece  # Coloca a peça na matriz do tabuleiro
+                        self.place_piece(piece)  # Coloca a peça na matriz do tabuleiro
 
         # Peças para tabuleiros de tamanho 4 ou 5
         if self.size== 4 or self.size== 5:
@@ -105,7 +120,7 @@ class Board:
                     else:
                         piece = Piece(self.size, row, col, WHITE)  # Cria uma nova peça branca
                         self.all_pieces_white.append(piece)  # Adiciona a peça à lista de peças brancas
-                        self.chessboard[row][col] = piece  # Coloca a peça na matriz do tabuleiro
+                        self.place_piece(piece)  # Coloca a peça na matriz do tabuleiro
 
             # Inicializa as peças pretas
             for row in range (2):
@@ -116,7 +131,7 @@ class Board:
                     else:
                         piece = Piece(self.size, row, col, BLACK)  # Cria uma nova peça preta
                         self.all_pieces_black.append(piece)  # Adiciona a peça à lista de peças pretas
-                        self.chessboard[row][col] = piece  # Coloca a peça na matriz do tabuleiro
+                        self.place_piece(piece)  # Coloca a peça na matriz do tabuleiro
 
         return self.all_pieces_white, self.all_pieces_black
 
@@ -201,37 +216,89 @@ class Board:
         Args:
             row (int): A linha da posição.
             col (int): A coluna da posição.
-            all_pieces_black (list): A lista de peças pretas.
-            all_pieces_white (list): A lista de peças brancas.
+            all_pieces_black (list): A lista de peças pretas (não usada; a procura é feita no índice de casas).
+            all_pieces_white (list): A lista de peças brancas (não usada; a procura é feita no índice de casas).
 
         Returns:
             Piece: A peça encontrada na posição, ou None se não houver nenhuma peça.
         """
-        # Itera sobre todas as peças para encontrar a peça na posição especificada
-        for piece in all_pieces_black + all_pieces_white:
-            if piece.row == row and piece.col == col:
-                return piece
-        return None  # Retorna None se não encontrar nenhuma peça
+        # Consulta diretamente o índice de casas do tabuleiro
+        if 0 <= row < self.size and 0 <= col < self.size:
+            return self.chessboard[row][col]
+        return None  # Retorna None se a posição estiver fora do tabuleiro
 
 
     def occupied(self):
         """
         Obtém as posições ocupadas pelas peças.
 
+        Os conjuntos são mantidos pelo tabuleiro a cada movimento, pelo que não
+        devem ser alterados por quem os consulta.
+
         Returns:
-            tuple: Uma tupla contendo duas listas:
-                - A primeira lista contém as posições ocupadas pelas peças brancas.
-                - A segunda lista contém as posições ocupadas pelas peças pretas.
+            tuple: Uma tupla contendo dois conjuntos:
+                - O primeiro contém as posições ocupadas pelas peças brancas.
+                - O segundo contém as posições ocupadas pelas peças pretas.
         """
-        taken_white = []
-        taken_black = []
-        # Itera sobre as peças brancas e adiciona as suas posições à lista
-        for i in range(len(self.all_pieces_white)):
-            taken_white += [(self.all_pieces_white[i].row, self.all_pieces_white[i].col)]
-        # Itera sobre as peças pretas e adiciona as suas posições à lista
-        for i in range(len(self.all_pieces_black)):
-            taken_black += [(self.all_pieces_black[i].row, self.all_pieces_black[i].col)]
-        return taken_white, taken_black
+        return self.white_squares, self.black_squares
+
+
+    @property
+    def hash(self):
+        """
+        Chave de Zobrist (64 bits) da posição: peças e jogador a jogar.
+
+        A parte das peças é mantida incrementalmente por place_piece e lift_piece
+        (movimentos, capturas, promoções e movimentos desfeitos).
+        """
+        if self.turn == BLACK:
+            return self.pieces_hash ^ self.zobrist['turn']
+        return self.pieces_hash
+
+
+    @property
+    def search_hash(self):
+        """
+        Chave de Zobrist da posição incluindo o contador de movimentos sem capturas.
+
+        É a chave da tabela de transposição: a mesma disposição das peças pode
+        estar a poucos movimentos do empate por falta de capturas, e então o
+        seu valor é outro. Para detetar repetições usa-se hash.
+        """
+        quiet = self.zobrist['quiet']
+        return self.hash ^ quiet[min(self.moves_whitout_catching, len(quiet) - 1)]
+
+
+    def place_piece(self, piece):
+        """
+        Coloca uma peça no índice de casas (matriz do tabuleiro e conjunto de casas da sua cor).
+
+        Args:
+            piece (Piece): A peça a colocar, na sua posição atual.
+        """
+        self.chessboard[piece.row][piece.col] = piece
+        self.version += 1
+        self.pieces_hash ^= self.zobrist['pieces'][(piece.color, piece.king)][piece.row][piece.col]
+        if piece.color == WHITE:
+            self.white_squares.add((piece.row, piece.col))
+        else:
+            self.black_squares.add((piece.row, piece.col))
+
+
+    def lift_piece(self, piece):
+        """
+        Retira uma peça do índice de casas, sem a remover das listas de peças.
+
+        Args:
+            piece (Piece): A peça a retirar, na sua posição atual.
+        """
+        self.chessboard[piece.row][piece.col] = None
+        self.version += 1
+        self.pieces_hash ^= self.zobrist['pieces'][(piece.color, piece.king)][piece.row][piece.col]
+        if piece.color == WHITE:
+            self.white_squares.discard((piece.row, piece.col))
+        else:
+            self.black_squares.discard((piece.row, piece.col))
 
 
     def drop_piece(self, row, col):
@@ -242,17 +309,16 @@ class Board:
             row (int): A linha da posição da peça a ser removida.
             col (int): A coluna da posição da peça a ser removida.
         """
-        # Remove a peça da lista de peças pretas, se estiver lá
-        for i in range(len(self.all_pieces_black)):
-            if row == self.all_pieces_black[i].row and col == self.all_pieces_black[i].col:
-                self.all_pieces_black.pop(i)
-                break
+        piece = self.chessboard[row][col]
+        if piece is None:
+            return
 
-        # Remove a peça da lista de peças brancas, se estiver lá
-        for i in range(len(self.all_pieces_white)):
-            if row == self.all_pieces_white[i].row and col == self.all_pieces_white[i].col:
-                self.all_pieces_white.pop(i)
-                break
+        self.lift_piece(piece)
+        # Remove a peça da lista da sua cor
+        if piece.color == WHITE:
+            self.all_pieces_white.remove(piece)
+        else:
+            self.all_pieces_black.remove(piece)
 
 
     def check_piece_to_capture(self, turn):
@@ -347,30 +413,53 @@ class Board:
         return piece
 
 
-    def check_winner(self):
-        """Verifica se há um vencedor."""
-        self.is_terminal = False  # Reinicia o estado terminal
-        legal_pieces_white, _ = self.find_available_moves(WHITE)
-        legal_pieces_black, _ = self.find_available_moves(BLACK)
+    def check_winner(self, moves=None):
+        """
+        Verifica se há um vencedor.
+
+        Só o jogador a jogar pode ficar sem movimentos, por isso apenas os movimentos
+        desse jogador são considerados. O resultado fica guardado até a posição mudar.
+
+        Args:
+            moves (list): Movimentos já gerados para o jogador a jogar, se existirem
+                          (basta saber se a lista está vazia). Se for None, procura-se
+                          apenas o primeiro movimento legal.
 
-        # Se não houver peças pretas ou o jogador preto não puder mover-se, o jogador branco vence
-        if len(self.all_pieces_black) == 0 or (not legal_pieces_black and self.turn == BLACK):  #or black cannot move
-            self.is_terminal = True
-            return "Player 1"
-        # Se não houver peças brancas ou o jogador branco não puder mover-se, o jogador preto vence
-        elif len(self.all_pieces_white) == 0 or (not legal_pieces_white and self.turn == WHITE):  #or white cannot move
-            self.is_terminal = True
-            return "Player 2"
+        Returns:
+            str: "Player 1", "Player 2", "Empate" ou None se o jogo continuar.
+        """
+        key = (self.version, self.turn, self.moves_whitout_catching)
+        if self.status_cache is not None and self.status_cache[0] == key:
+            self.is_terminal = self.status_cache[1] is not None
+            return self.status_cache[1]
+
+        winner = None
+        # Se não houver peças pretas, o jogador branco vence; se não houver peças brancas, o jogador preto vence
+        if len(self.all_pieces_black) == 0:
+            winner = "Player 1"
+        elif len(self.all_pieces_white) == 0:
+            winner = "Player 2"
+
+        # Se o jogador a jogar não puder mover-se, perde
+        elif self.turn in (WHITE, BLACK) and not (self.has_any_move(self.turn) if moves is None else moves):
+            winner = "Player 1" if self.turn == BLACK else "Player 2"
 
         # Se o número de movimentos sem captura atingir um limite, o jogo termina em empate
-        if self.moves_whitout_catching == self.size*7:
-            return "Empate" # Retorna "Empate" em vez de "Tie"
+        elif self.moves_whitout_catching == self.size*7:
+            winner = "Empate" # Retorna "Empate" em vez de "Tie"
+
+        self.is_terminal = winner is not None
+        self.status_cache = (key, winner)
+        return winner
 
 
     def find_available_moves(self, turn):
         """
         Encontra os movimentos disponíveis para um determinado jogador.
 
+        Agrupa por peça os movimentos de iter_available_moves: com capturas,
+        cada peça tem as casas onde pode parar depois do primeiro salto.
+
         Args:
             turn (tuple): A cor do jogador atual (WHITE ou BLACK).
 
@@ -379,47 +468,14 @@ class Board:
                 - A primeira lista contém as peças que podem mover-se.
                 - A segunda lista contém os movimentos legais para cada peça.
         """
-        legal_moves = []
-        # Verifica se alguma peça pode capturar
-        legal_pieces = self.check_piece_to_capture(turn)
-
-        # Se houver peças que podem capturar, encontra os movimentos legais para cada peça
-        if legal_pieces:
-
-            # Obtém os movimentos legais para cada peça, seja dama ou não
-            for piece in legal_pieces:
-                if piece.king:
-                    piece.check_catch_king(self)
-                    legal_moves.append(piece.legal)
-                else:
-                    piece.check_catch(self)
-                    legal_moves.append(piece.legal)
-
-        # Se não houver peças que podem capturar, encontra os movimentos normais
-        else:
-
-            # Seleciona a lista de peças do jogador atual
-            if turn == WHITE:
-                legal_pieces = self.all_pieces_white
-            else:
-                legal_pieces = self.all_pieces_black
-
-            # Obtém os movimentos legais para cada peça
-            for piece in legal_pieces:
-                piece.legal_positions()
-                piece.check_position(self)
-                piece.no_jump(self)
-                legal_moves.append(piece.legal)
-
-            # Remove as peças sem movimentos disponíveis
-            index = []
-            for i in range(len(legal_moves)):
-                if legal_moves[i] == []:
-                    index.append(i)
-
-            legal_pieces = [legal_pieces[i] for i in range(len(legal_pieces)) if i not in index]
-            legal_moves = [legal_moves[i] for i in range(len(legal_moves)) if i not in index]
-
+        targets = {}  # Casas de destino de cada peça, pela ordem em que são geradas
+        for move in self.iter_available_moves(turn):
+            squares = targets.setdefault(move[0], [])
+            if move[1] not in squares:
+                squares.append(move[1])
+
+        legal_pieces = [self.chessboard[row][col] for row, col in targets]
+        legal_moves = list(targets.values())
         return legal_pieces, legal_moves
 
 
@@ -439,10 +495,353 @@ class Board:
 
 
     def count_possible_moves(self):
-        """Conta o número de movimentos possíveis para o jogador atual."""
-        legal_pieces, legal_moves = self.find_available_moves(self.turn)
-        n_children = 0
-        for i in range(len(legal_pieces)):
-            for j in range(len(legal_moves)):
-                n_children += 1
-        return n_children
\ No newline at end of file
+        """Conta o número de movimentos possíveis para o jogador atual (capturas múltiplas completas)."""
+        return sum(1 for move in self.iter_available_moves(self.turn))
+
+
+    def get_all_moves(self, turn):
+        """
+        Obtém a lista de movimentos legais de um jogador no formato usado por make_move.
+
+        Args:
+            turn (tuple): A cor do jogador (WHITE ou BLACK).
+
+        Returns:
+            list: Lista de caminhos ((row, col), (new_row, new_col), ...), com as capturas múltiplas completas.
+        """
+        return list(self.iter_available_moves(turn))
+
+
+    def iter_captures(self, turn):
+        """
+        Gera, um a um, os movimentos de captura de um jogador.
+
+        Cada movimento é uma captura múltipla completa (ver capture_sequences).
+        Se uma peça estiver a meio de uma captura múltipla, só essa peça pode
+        capturar (como em check_piece_to_capture).
+
+        Args:
+            turn (tuple): A cor do jogador (WHITE ou BLACK).
+
+        Yields:
+            tuple: Caminhos ((row, col), (new_row, new_col), ...).
+        """
+        # Cópia da lista: quem consome o gerador pode fazer e desfazer movimentos entretanto
+        pieces = list(self.all_pieces_black if turn == BLACK else self.all_pieces_white)
+
+        # Peça a meio de uma captura múltipla (captura obrigatória com a mesma peça)
+        for piece in pieces:
+            if piece.has_caught:
+                sequences = self.capture_sequences(piece)
+                if sequences:
+                    for path, captured in sequences:
+                        yield path
+                    return
+
+        for piece in pieces:
+            for path, captured in self.capture_sequences(piece):
+                yield path
+
+
+    def iter_piece_moves(self, piece):
+        """
+        Gera os movimentos normais (sem captura) de uma peça.
+
+        Args:
+            piece (Piece): A peça.
+
+        Yields:
+            tuple: Movimentos ((row, col), (new_row, new_col)).
+        """
+        piece.legal_positions()
+        piece.check_position(self)
+        piece.no_jump(self)
+        start = (piece.row, piece.col)
+        for move in piece.legal:
+            yield (start, move)
+
+
+    def iter_available_moves(self, turn):
+        """
+        Gera os movimentos legais de um jogador um de cada vez, sem os calcular todos à partida.
+
+        As capturas (capturas múltiplas completas) são geradas primeiro; se existir
+        alguma, os movimentos normais não são gerados (captura obrigatória). Quem
+        consome o gerador pode parar a qualquer momento (ex: num corte Alpha-Beta).
+
+        Args:
+            turn (tuple): A cor do jogador (WHITE ou BLACK).
+
+        Yields:
+            tuple: Caminhos ((row, col), (new_row, new_col), ...) no formato de make_move.
+        """
+        has_capture = False
+        for move in self.iter_captures(turn):
+            has_capture = True
+            yield move
+
+        if not has_capture:
+            for piece in list(self.all_pieces_black if turn == BLACK else self.all_pieces_white):
+                yield from self.iter_piece_moves(piece)
+
+
+    def has_any_move(self, turn):
+        """
+        Verifica se um jogador tem algum movimento legal, parando no primeiro encontrado.
+
+        Args:
+            turn (tuple): A cor do jogador (WHITE ou BLACK).
+
+        Returns:
+            bool: True se o jogador puder mover-se.
+        """
+        pieces = self.all_pieces_black if turn == BLACK else self.all_pieces_white
+
+        # Basta um primeiro salto de captura (não é preciso enumerar as capturas múltiplas)
+        for piece in pieces:
+            if piece.king:
+                piece.check_catch_king(self)
+            else:
+                piece.check_catch(self)
+            if piece.legal:
+                return True
+
+        for piece in pieces:
+            for move in self.iter_piece_moves(piece):
+                return True
+        return False
+
+
+    def make_move(self, move):
+        """
+        Executa um movimento e devolve o registo necessário para o desfazer.
+
+        O movimento é o caminho da peça: a casa de partida seguida das casas onde
+        pousa. Uma captura múltipla completa é um único movimento com vários saltos.
+        No fim, se a peça ainda puder continuar a capturar (caminho incompleto) o
+        turno mantém-se; caso contrário, a peça é promovida a dama e o turno passa.
+
+        Args:
+            move (tuple): O caminho ((row, col), (new_row, new_col), ...).
+
+        Returns:
+            dict: O registo de desfazer, a passar a unmake_move.
+        """
+        row, col = move[0]
+        piece = self.chessboard[row][col]
+        opponents = self.all_pieces_black if piece.color == WHITE else self.all_pieces_white
+
+        undo = {
+            'piece': piece,
+            'position': (row, col),
+            'previous_position': piece.previous_position,
+            'king': piece.king,
+            'has_caught': piece.has_caught,
+            'captured': [],  # Peças capturadas em cada salto, com a posição que tinham na lista
+            'moves_whitout_catching': self.moves_whitout_catching,
+            'last_moved_piece': self.last_moved_piece,
+            'last_move': self.last_move,
+            'turn': self.turn,
+            'is_terminal': self.is_terminal,
+            'complete': True,  # False se a peça ainda puder continuar a capturar
+        }
+
+        for new_row, new_col in move[1:]:
+            # Peças adversárias no caminho (só os movimentos em linha ou coluna capturam)
+            captured = []
+            if piece.row == new_row or piece.col == new_col:
+                dr = (new_row > piece.row) - (new_row < piece.row)
+                dc = (new_col > piece.col) - (new_col < piece.col)
+                r, c = piece.row + dr, piece.col + dc
+                while (r, c) != (new_row, new_col):
+                    other = self.chessboard[r][c]
+                    if other is not None and other.color != piece.color:
+                        captured.append((opponents.index(other), other))
+                    r, c = r + dr, c + dc
+                captured.sort(key=lambda item: item[0])  # Ordem crescente para reinserir nas listas
+            undo['captured'].append(captured)
+
+            piece.move(new_row, new_col, self)  # Move a peça (e elimina as peças capturadas)
+
+        # Captura múltipla incompleta: a mesma peça continua a jogar
+        if piece.has_caught:
+            if piece.king:
+                piece.check_catch_king(self)
+            else:
+                piece.check_catch(self)
+            if piece.legal:
+                undo['complete'] = False
+                return undo
+
+        # Fim do movimento: promoção e mudança de turno
+        piece.transform_king(self)
+        piece.has_caught = False  # A captura terminou, não deve restringir as próximas jogadas
+        self.turn = BLACK if piece.color == WHITE else WHITE
+        return undo
+
+
+    def unmake_move(self, undo):
+        """
+        Desfaz um movimento feito com make_move.
+
+        Args:
+            undo (dict): O registo devolvido por make_move.
+        """
+        piece = undo['piece']
+        row, col = undo['position']
+
+        # Devolve a peça à posição original
+        self.lift_piece(piece)
+        piece.row = row
+        piece.col = col
+        piece.right = self.size - 1 - col
+        piece.down = self.size - 1 - row
+        piece.previous_position = undo['previous_position']
+        piece.king = undo['king']
+        piece.has_caught = undo['has_caught']
+        self.place_piece(piece)
+
+        # Repõe as peças capturadas nas posições originais das listas (do último salto para o primeiro)
+        opponents = self.all_pieces_black if piece.color == WHITE else self.all_pieces_white
+        for captured in reversed(undo['captured']):
+            for index, other in captured:
+                opponents.insert(index, other)
+                self.place_piece(other)
+
+        self.moves_whitout_catching = undo['moves_whitout_catching']
+        self.last_moved_piece = undo['last_moved_piece']
+        self.last_move = undo['last_move']
+        self.turn = undo['turn']
+        self.is_terminal = undo['is_terminal']
+
+
+    def make_null_move(self):
+        """
+        Passa a vez ao adversário sem mover nenhuma peça (usado pela poda de movimento nulo).
+
+        Returns:
+            dict: O registo de desfazer, a passar a unmake_null_move.
+        """
+        undo = {'turn': self.turn, 'is_terminal': self.is_terminal}
+        self.turn = BLACK if self.turn == WHITE else WHITE
+        return undo
+
+
+    def unmake_null_move(self, undo):
+        """
+        Desfaz uma passagem de vez feita com make_null_move.
+
+        Args:
+            undo (dict): O registo devolvido por make_null_move.
+        """
+        self.turn = undo['turn']
+        self.is_terminal = undo['is_terminal']
+
+
+    def capture_sequences(self, piece):
+        """
+        Enumera as capturas múltiplas completas de uma peça (pesquisa em profundidade).
+
+        Cada salto é feito e desfeito no tabuleiro; uma sequência termina quando a
+        peça já não pode capturar mais nenhuma peça.
+
+        Args:
+            piece (Piece): A peça que captura.
+
+        Returns:
+            list: Lista de pares (caminho, casas capturadas), em que o caminho é
+                  ((row, col), (new_row, new_col), ...) e as casas capturadas são as
+                  posições das peças adversárias, pela ordem em que são capturadas.
+        """
+        sequences = []
+        self.extend_capture_sequence(piece, [(piece.row, piece.col)], [], sequences)
+        return sequences
+
+
+    def extend_capture_sequence(self, piece, path, captured, sequences):
+        """
+        Passo recursivo de capture_sequences: tenta todos os saltos seguintes a partir da posição atual.
+
+        Args:
+            piece (Piece): A peça que captura.
+            path (list): O caminho percorrido até agora.
+            captured (list): As casas capturadas até agora.
+            sequences (list): Lista onde são acrescentadas as sequências completas.
+        """
+        if piece.king:
+            piece.check_catch_king(self)
+        else:
+            piece.check_catch(self)
+
+        for landing in piece.legal:
+            undo = self.make_move(((piece.row, piece.col), landing))
+            jumped = [(other.row, other.col) for index, other in undo['captured'][0]]
+            if undo['complete']:
+                sequences.append((tuple(path + [landing]), tuple(captured + jumped)))
+            else:
+                self.extend_capture_sequence(piece, path + [landing], captured + jumped, sequences)
+            self.unmake_move(undo)
+
+
+    def to_bitboard(self):
+        """
+        Exporta a posição atual para a representação em máscaras de bits.
+
+        Returns:
+            BitBoard: A posição equivalente (peças, turno, contador de movimentos sem capturas
+                      e peça a meio de uma captura múltipla, se houver).
+        """
+        bitboard = BitBoard(self.size, turn=self.turn, moves_whitout_catching=self.moves_whitout_catching)
+        for piece in self.all_pieces_white + self.all_pieces_black:
+            bit = 1 << bitboard.square(piece.row, piece.col)
+            if piece.color == WHITE:
+                if piece.king:
+                    bitboard.white_kings |= bit
+                else:
+                    bitboard.white_men |= bit
+            else:
+                if piece.king:
+                    bitboard.black_kings |= bit
+                else:
+                    bitboard.black_men |= bit
+
+        # Peça que acabou de capturar e ainda pode continuar a captura
+        piece = self.last_moved_piece
+        if piece is not None and piece.has_caught and piece.color == self.turn and self.chessboard[piece.row][piece.col] is piece:
+            square = bitboard.square(piece.row, piece.col)
+            if bitboard.piece_captures(square):
+                bitboard.capturing_square = square
+        return bitboard
+
+
+    @classmethod
+    def from_bitboard(cls, bitboard):
+        """
+        Cria um tabuleiro a partir de uma posição em máscaras de bits.
+
+        Args:
+            bitboard (BitBoard): A posição a carregar.
+
+        Returns:
+            Board: Um novo tabuleiro com as peças, o turno e o contador da posição.
+        """
+        board = cls(bitboard.size)
+        for square in iter_bits(bitboard.pieces(WHITE) | bitboard.pieces(BLACK)):
+            row, col = bitboard.position(square)
+            color = WHITE if bitboard.pieces(WHITE) >> square & 1 else BLACK
+            piece = Piece(board.size, row, col, color, king=bool(bitboard.kings(color) >> square & 1))
+            if color == WHITE:
+                board.all_pieces_white.append(piece)
+            else:
+                board.all_pieces_black.append(piece)
+            board.place_piece(piece)
+
+            # Peça a meio de uma captura múltipla
+            if square == bitboard.capturing_square:
+                piece.has_caught = True
+                board.last_moved_piece = piece
+                board.last_move = (row, col)
+
+        board.turn = bitboard.turn
+        board.moves_whitout_catching = bitboard.moves_whitout_catching
+        return board
@@ -0,0 +1,164 @@
+import sys
+import time
+from vars import *
+from board import Board
+from ai import MontecarloTreeSearch
+
+
+def benchmark(size=8, iterations=200, max_threads=4):
+    """
+    Mede o ritmo do MCTS com paralelismo na árvore, de 1 até max_threads threads.
+
+    Só há ganho real num CPython sem GIL; com o GIL as simulações não correm em simultâneo.
+
+    Args:
+        size (int): O tamanho do tabuleiro.
+        iterations (int): O número de iterações de cada pesquisa.
+        max_threads (int): O número máximo de threads a testar.
+
+    Returns:
+        list: Para cada número de threads, o tuplo (threads, segundos, iterações por segundo).
+    """
+    board = Board(size)
+    board.initialize_pieces()
+    board.turn = WHITE
+
+    results = []
+    for threads in range(1, max_threads + 1):
+        monte_carlo = MontecarloTreeSearch(iterations, threads=threads)
+        start = time.perf_counter()
+        monte_carlo.mcts(board, WHITE)
+        elapsed = time.perf_counter() - start
+        results.append((threads, elapsed, iterations / elapsed))
+    return results
+
+
+def benchmark_rollouts(size=8, simulations=2048, batches=(1, 64, 256)):
+    """
+    Mede o ritmo das simulações do MCTS com diferentes números de simulações por folha.
+
+    Com mais de uma simulação por folha os jogos são simulados em conjunto com NumPy.
+
+    Args:
+        size (int): O tamanho do tabuleiro.
+        simulations (int): O número aproximado de simulações de cada pesquisa.
+        batches (tuple): Os números de simulações por folha a testar.
+
+    Returns:
+        list: Para cada número de simulações por folha, o tuplo (simulações por folha, segundos, simulações por segundo).
+    """
+    board = Board(size)
+    board.initialize_pieces()
+    board.turn = WHITE
+
+    results = []
+    for rollouts in batches:
+        iterations = max(1, simulations // rollouts)
+        monte_carlo = MontecarloTreeSearch(iterations, rollouts=rollouts)
+        start = time.perf_counter()
+        monte_carlo.mcts(board, WHITE)
+        elapsed = time.perf_counter() - start
+        results.append((rollouts, elapsed, iterations * rollouts / elapsed))
+    return results
+
+
+def benchmark_time_budget(sizes=(5, 6, 7, 8), time_limit=1.0, moves=6):
+    """
+    Mede quantas iterações o MCTS faz por jogada com um limite de tempo, em cada tamanho de tabuleiro.
+
+    Joga as primeiras jogadas de um jogo do MCTS contra si próprio, para incluir
+    posições depois da abertura.
+
+    Args:
+        sizes (tuple): Os tamanhos de tabuleiro a testar.
+        time_limit (float): O tempo por jogada em segundos.
+        moves (int): O número de jogadas medidas em cada tamanho.
+
+    Returns:
+        list: Para cada tamanho, o tuplo (tamanho, lista das iterações feitas em cada jogada).
+    """
+    results = []
+    for size in sizes:
+        board = Board(size)
+        board.initialize_pieces()
+        board.turn = WHITE
+        players = {WHITE: MontecarloTreeSearch(None, time_limit=time_limit),
+                   BLACK: MontecarloTreeSearch(None, time_limit=time_limit)}
+        iterations = []
+        for _ in range(moves):
+            monte_carlo = players[board.turn]
+            board.make_move(monte_carlo.mcts(board, board.turn))
+            iterations.append(monte_carlo.search_stats()['iterations'])
+            if board.check_winner():
+                break
+        results.append((size, iterations))
+    return results
+
+
+def check_prior_perspective(size=6, iterations=1000, evaluation_func=1):
+    """
+    Verifica que os priors e os valores dos nós do MCTS são do mesmo ponto de vista.
+
+    Com rollout_limit=0, cada simulação é decidida logo pelo sinal da função
+    de avaliação, a mesma que dá os priors. Assim, entre dois filhos do mesmo
+    nó com uma só visita, o que tem maior prior não pode ter menor valor. As
+    discordâncias são contadas separadamente nas profundidades pares e ímpares
+    (os nós ímpares são movimentos do jogador da raiz, os pares do adversário,
+    salvo em capturas múltiplas).
+
+    Args:
+        size (int): O tamanho do tabuleiro.
+        iterations (int): O número de iterações da pesquisa.
+        evaluation_func (int): A função de avaliação usada nos priors e nas simulações.
+
+    Returns:
+        int: O número de pares de filhos comparados.
+
+    Raises:
+        AssertionError: Se houver discordâncias (indicando quantas nas profundidades pares e ímpares).
+    """
+    board = Board(size)
+    board.initialize_pieces()
+    board.turn = WHITE
+    monte_carlo = MontecarloTreeSearch(iterations, rollout_limit=0, rollout_evaluation=evaluation_func,
+                                       prior_evaluation=evaluation_func)
+    monte_carlo.mcts(board, WHITE)
+
+    tree = monte_carlo.tree
+    pairs = 0
+    disagreements = [0, 0]  # Profundidades pares e ímpares dos filhos
+    pending = [(monte_carlo.search_root, 0)]
+    while pending:
+        node, depth = pending.pop()
+        leaves = []
+        for child in tree.children(node):
+            pending.append((child, depth + 1))
+            if tree.visits[child] == 1 and not tree.terminal[child]:
+                leaves.append((tree.prior[child], tree.reward[child]))
+        for prior, value in leaves:
+            for other_prior, other_value in leaves:
+                if prior > other_prior:
+                    pairs += 1
+                    if value < other_value:
+                        disagreements[(depth + 1) % 2] += 1
+    assert disagreements == [0, 0], (
+        f"priors e valores discordam: {disagreements[0]} pares nas profundidades pares, {disagreements[1]} nas ímpares")
+    return pairs
+
+
+if __name__ == "__main__":
+    max_threads = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print(f"GIL {'ativo' if gil else 'desativado'}")
+    results = benchmark(max_threads=max_threads)
+    base = results[0][2]
+    for threads, elapsed, rate in results:
+        print(f"{threads} threads: {elapsed:.2f}s, {rate:.1f} iterações/s (x{rate / base:.2f})")
+
+    results = benchmark_rollouts()
+    base = results[0][2]
+    for rollouts, elapsed, rate in results:
+        print(f"{rollouts} simulações por folha: {elapsed:.2f}s, {rate:.1f} simulações/s (x{rate / base:.2f})")
+
+    for size, iterations in benchmark_time_budget():
+        print(f"{size}x{size}: {', '.join(map(str, iterations))} iterações por jogada")
@@ -27,7 +27,6 @@ class Piece:
         self.legal = []  # Lista de movimentos legais para a peça
         self.right = size - 1 - self.col  # Espaço livre à direita da peça
         self.down = size - 1 - self.row  # Espaço livre abaixo da peça
-        self.catch = False  # Flag para indicar se a peça pode capturar outra peça
         self.previous_position = ()  # Posição anterior da peça
         self.has_caught = False  # Flag para indicar se a peça já capturou outra peça
 
@@ -42,39 +41,24 @@ class Piece:
             board (Board): O tabuleiro do jogo.
         """
         self.previous_position = (self.row, self.col)  # Guarda a posição anterior da peça
+        board.lift_piece(self)  # Retira a peça do índice de casas do tabuleiro
         self.row = row  # Atualiza a linha da posição da peça
         self.col = col  # Atualiza a coluna da posição da peça
         self.right = self.size - 1 - col  # Recalcula o espaço livre à direita
         self.down = self.size - 1 - row  # Recalcula o espaço livre abaixo
         self.has_caught = False  # Reinicia o estado de captura
-
-        # Elimina a peça capturada, se houver
-        if (self.row == self.previous_position[0] and self.col != self.previous_position[1]) or (self.row != self.previous_position[0] and self.col == self.previous_position[1]):  # Evita esta função para movimentos diagonais (sem capturas)
-            if abs(self.previous_position[0] - self.row) > 1:  # Movimento vertical maior que um quadrado
-                for i in range(1, abs(self.row - self.previous_position[0])):
-                    # Captura para cima
-                    if self.previous_position[0] > self.row and board.chessboard[self.previous_position[0] - i][self.previous_position[1]] != None and board.chessboard[self.previous_position[0] - i][self.previous_position[1]].color != self.color:
-                        board.drop_piece(self.previous_position[0] - i, self.previous_position[1])
-                        board.chessboard[self.previous_position[0] - i][self.previous_position[1]] = None
-                        self.has_caught = True
-                    # Captura para baixo
-                    if self.previous_position[0] < self.row and board.chessboard[self.previous_position[0] + i][self.previous_position[1]] != None and board.chessboard[self.previous_position[0] + i][self.previous_position[1]].color != self.color:
-                        board.drop_piece(self.previous_position[0] + i, self.previous_position[1])
-                        board.chessboard[self.previous_position[0] + i][self.previous_position[1]] = None
-                        self.has_caught = True
-
-            if abs(self.previous_position[1] - self.col) > 1:  # Movimento horizontal maior que um quadrado
-                # Captura para a esquerda
-                for i in range(1, abs(self.col - self.previous_position[1])):
-                    if self.previous_position[1] > self.col and board.chessboard[self.previous_position[0]][self.previous_position[1] - i] != None and board.chessboard[self.previous_position[0]][self.previous_position[1] - i].color != self.color:
-                        board.drop_piece(self.previous_position[0], self.previous_position[1] - i)
-                        board.chessboard[self.previous_position[0]][self.previous_position[1] - i] = None
-                        self.has_caught = True
-                    # Captura para a direita
-                    if self.previous_position[1] < self.col and board.chessboard[self.previous_position[0]][self.previous_position[1] + i] != None and board.chessboard[self.previous_position[0]][self.previous_position[1] + i].color != self.color:
-                        board.drop_piece(self.previous_position[0], self.previous_position[1] + i)
-                        board.chessboard[self.previous_position[0]][self.previous_position[1] + i] = None
-                        self.has_caught = True
+        board.place_piece(self)  # Coloca a peça na nova casa do índice
+
+        # Elimina as peças capturadas, se houver
+        previous_row, previous_col = self.previous_position
+        if (self.row == previous_row) != (self.col == previous_col):  # Evita esta função para movimentos diagonais (sem capturas)
+            dr = (self.row > previous_row) - (self.row < previous_row)
+            dc = (self.col > previous_col) - (self.col < previous_col)
+            for i in range(1, max(abs(self.row - previous_row), abs(self.col - previous_col))):
+                other = board.chessboard[previous_row + i * dr][previous_col + i * dc]
+                if other is not None and other.color != self.color:
+                    board.drop_piece(other.row, other.col)
+                    self.has_caught = True
 
         board.moves_whitout_catching += 1  # Incrementa o contador de movimentos sem captura
         if self.has_caught:
@@ -84,12 +68,19 @@ class Piece:
         board.last_move = (row, col)  # Define o movimento como o último movimento
 
 
-    def transform_king(self):
-        """Transforma a peça numa dama se ela chegar à extremidade oposta do tabuleiro."""
-        if self.row == 0 and self.color == WHITE and self.king == False:
-            self.king = True
-        if self.row == self.size - 1 and self.color == BLACK and self.king == False:
+    def transform_king(self, board=None):
+        """
+        Transforma a peça numa dama se ela chegar à extremidade oposta do tabuleiro.
+
+        Args:
+            board (Board): O tabuleiro do jogo, para atualizar a chave de Zobrist da posição.
+        """
+        if (self.row == 0 and self.color == WHITE and self.king == False) or (self.row == self.size - 1 and self.color == BLACK and self.king == False):
+            if board is not None:
+                board.lift_piece(self)  # Retira a peça normal do índice (e da chave de Zobrist)
             self.king = True
+            if board is not None:
+                board.place_piece(self)  # Volta a colocá-la, agora como dama
 
 
     def legal_positions(self):
@@ -141,277 +132,65 @@ class Piece:
 
     def check_position(self, board):
         """Verifica se as posições legais estão ocupadas e remove as posições inválidas."""
-        arg_taken = []
-        arg_inval = []
-        inval=[]
         whites, blacks = board.occupied()
+        own = whites if self.color == WHITE else blacks
+
         # Remove posições ocupadas por outras peças
-        op_pieces = whites + blacks
-
-        for i in range(len(self.legal)):
-            if self.legal[i] in whites or self.legal[i] in blacks:
-                arg_taken.append(i)
-        self.legal = [self.legal[i] for i in range(len(self.legal)) if i not in arg_taken]
-
-        # Remove posições inválidas para peças normais (não damas)
-        if self.color == BLACK and not self.king:
-            # Remove posições extra para baixo
-            if self.down >= 2:
-                if (self.row+1, self.col) not in blacks and (self.row+1, self.col) not in whites:
-                    for i in range(2, self.down+1):
-                        inval+= [(self.row+i, self.col)]
-
-                if self.down >= 3 and (self.row+1, self.col) in whites:
-                    # Remove a casa três espaços abaixo até ao fim
-                    for i in range(3, self.down+1):
-                        inval+= [(self.row+i, self.col)]
-
-                for j in range (3, self.size-1):
-                    if self.down >= j and (self.row+1, self.col) in blacks:
-                        for k in range (2, j+1):
-                            if (self.row+k, self.col) not in blacks:
-                             # Remove a casa k+1 espaços abaixo até ao fim
-                                 for i in range(k+1, self.down+1):
-                                     inval+= [(self.row+i, self.col)]
-
-            # Remove posições em excesso diagonal direita/baixo
-            for j in range (2, self.size-1):
-                 if min(self.down, self.right) >= j:  # and (self.row+1, self.col+1) not in blacks:
-                   for k in range (1, j+1):
-                        if (self.row+k, self.col+k) not in blacks:
-                            for i in range(k+1, min(self.down, self.right)+1):
-                                 inval+= [(self.row+i, self.col+i)]
-
-            # Remove posições em excesso esquerda/baixo
-            for j in range (2, self.size-1):
-                 if min(self.down, self.col) >= j:  # and (self.row+1, self.col+1) not in blacks:
-                   for k in range (1, j+1):
-                        if (self.row+k, self.col-k) not in blacks:
-                            for i in range(k+1, min(self.down, self.col)+1):
-                                 inval+= [(self.row+i, self.col-i)]
-
-        if self.color == WHITE and not self.king:
-            # Remove posições extra para cima
-            if self.row >= 2:
-                if (self.row-1, self.col) not in blacks and (self.row-1, self.col) not in whites:
-                    for i in range(2, self.row+1):
-                        inval += [(self.row-i, self.col)]
-
-            if self.row >= 3 and (self.row-1, self.col) in blacks:
-                # Remove posições três espaços acima até ao fim
-                for i in range(3, self.row+1):
-                    inval += [(self.row-i, self.col)]
-
-            for j in range(3, self.size):
-                if self.row >= j and (self.row-1, self.col) in whites:
-                    for k in range(2, j):
-                        if (self.row-k, self.col) not in whites:
-                            # Remove posições k+1 espaços acima até ao fim
-                            for i in range(k+1, self.row+1):
-                                inval += [(self.row-i, self.col)]
-
-            # Remove posições em excesso diagonal esquerda/cima
-            for j in range(2, self.size-1):
-                if min(self.row, self.col) >= j:
-                    for k in range(1, j+1):
-                        if (self.row-k, self.col-k) not in whites:
-                            for i in range(k+1, min(self.row, self.col)+1):
-                                inval += [(self.row-i, self.col-i)]
-
-            # Remove posições em excesso direita/cima
-            for j in range(2, self.size-1):
-                if min(self.row, self.right) >= j:
-                    for k in range(1, j+1):
-                        if (self.row-k, self.col+k) not in whites:
-                            for i in range(k+1, min(self.row, self.right)+1):
-                                inval += [(self.row-i, self.col+i)]
-
-        # Remove as posições inválidas da lista de posições legais
-        for j in range(len(self.legal)):
-            if self.legal[j] in inval:
-                arg_inval.append(j)
-
-        self.legal = [self.legal[j] for j in range(len(self.legal)) if j not in arg_inval]
+        self.legal = [position for position in self.legal if position not in whites and position not in blacks]
+
+        # Peças normais (não damas): só podem saltar sobre peças da mesma cor, parando na primeira casa seguinte
+        if not self.king:
+            forward = -1 if self.color == WHITE else 1
+            reachable = []
+            for dc in (0, 1, -1):
+                row, col = self.row + forward, self.col + dc
+                while 0 <= row < self.size and 0 <= col < self.size and (row, col) in own:
+                    row, col = row + forward, col + dc
+                reachable.append((row, col))
+            self.legal = [position for position in self.legal if position in reachable]
 
 
     def no_jump(self, board):
         """Remove as posições legais onde a peça saltaria sobre outra peça."""
-        to_pop = []
-        whites, blacks = board.occupied()
-        op_pieces = whites + blacks
-
         if self.king:
-            for i in range(len(self.legal)):
-                if self.legal[i][0] == self.row:  # Posição legal na mesma linha
-                    for j in range(1, abs(self.legal[i][1] - self.col) + 1):
-                        # if self.col > self.legal[i][1] and (self.row, self.col - j) in whites:  # Posição legal à esquerda
-                        if self.col > self.legal[i][1] and (self.row, self.col - j) in op_pieces:  # Posição legal à esquerda
-                            to_pop.append(i)
-                        if self.col < self.legal[i][1] and (self.row, self.col + j) in op_pieces:  # Posição legal à direita
-                            to_pop.append(i)
-
-                elif self.legal[i][1] == self.col:  # Posição legal na mesma coluna
-                    for j in range(1, abs(self.legal[i][0] - self.row) + 1):
-                        if self.row > self.legal[i][0] and (self.row - j, self.col) in op_pieces:  # Posição legal para cima
-                            to_pop.append(i)
-                        if self.row < self.legal[i][0] and (self.row + j, self.col) in op_pieces:  # Posição legal para baixo
-                            to_pop.append(i)
-
-                else:  # Posição legal na diagonal
-                    for j in range(1, abs(self.legal[i][0] - self.row)):
-                        if self.row > self.legal[i][0] and self.col > self.legal[i][1] and (self.row - j, self.col - j) in op_pieces:  # Posição legal cima esquerda
-                            to_pop.append(i)
-                        if self.row > self.legal[i][0] and self.col < self.legal[i][1] and (self.row - j, self.col + j) in op_pieces:  # Posição legal cima direita
-                            to_pop.append(i)
-                        if self.row < self.legal[i][0] and self.col > self.legal[i][1] and (self.row + j, self.col - j) in op_pieces:  # Posição legal baixo esquerda
-                            to_pop.append(i)
-                        if self.row < self.legal[i][0] and self.col < self.legal[i][1] and (self.row + j, self.col + j) in op_pieces:  # Posição legal baixo direita
-                            to_pop.append(i)
-
-        # Remove as posições onde a peça saltaria sobre outra peça
-        self.legal = [self.legal[i] for i in range(len(self.legal)) if i not in to_pop]
+            # A dama desliza em cada direção enquanto as casas estiverem livres
+            reachable = set()
+            for dr, dc in ALL_DIRECTIONS:
+                row, col = self.row + dr, self.col + dc
+                while 0 <= row < self.size and 0 <= col < self.size and board.chessboard[row][col] is None:
+                    reachable.add((row, col))
+                    row, col = row + dr, col + dc
+
+            # Remove as posições onde a peça saltaria sobre outra peça
+            self.legal = [position for position in self.legal if position in reachable]
 
 
     def check_catch(self, board):
         """Calcula as posições legais para a peça capturar outras peças."""
-        catchable = [(self.row - 1, self.col), (self.row + 1, self.col), (self.row, self.col + 1), (self.row, self.col - 1)]  # Posições onde peças capturáveis podem estar
-        landing_pos = [(self.row - 2, self.col), (self.row + 2, self.col), (self.row, self.col + 2), (self.row, self.col - 2)]  # Posição depois disso
         self.legal = []
-        whites, blacks = board.occupied()
-
-        if self.color == WHITE:
-            for i in range(len(catchable)):
-                if catchable[i] in blacks and landing_pos[i] not in whites + blacks and landing_pos[i][1] <= self.size - 1:
-                    self.legal += [(landing_pos[i])]
-        if self.color == BLACK:
-            for i in range(len(catchable)):
-                if catchable[i] in whites and landing_pos[i] not in whites + blacks and landing_pos[i][1] <= self.size - 1:
-                    self.legal += [(landing_pos[i])]
-        self.drop_out_range()
+        # Cima, baixo, direita e esquerda: peça adversária adjacente e casa livre a seguir
+        for dr, dc in [(-1, 0), (1, 0), (0, 1), (0, -1)]:
+            row, col = self.row + 2 * dr, self.col + 2 * dc
+            if 0 <= row < self.size and 0 <= col < self.size and board.chessboard[row][col] is None:
+                other = board.chessboard[self.row + dr][self.col + dc]
+                if other is not None and other.color != self.color:
+                    self.legal += [(row, col)]
 
 
     def check_catch_king(self, board):
         """Calcula as posições legais para a dama capturar outras peças."""
         self.legal = []
-        # Verificação para baixo
-        end = False
-        for i in range(1, self.down + 1):
-            # Se encontrar uma peça adjacente e a próxima casa estiver ocupada ou for da mesma cor, para
-            if self.row + i + 1 <= self.size - 1 and board.chessboard[self.row + i][self.col] != None and (board.chessboard[self.row + i + 1][self.col] != None or board.chessboard[self.row + i][self.col].color == self.color):
-                break
-
-            # Se encontrar uma peça adjacente de cor diferente e a próxima casa estiver livre
-            if self.row + i + 1 <= self.size - 1 and board.chessboard[self.row + i][self.col] != None and board.chessboard[self.row + i][self.col].color != self.color and board.chessboard[self.row + i + 1][self.col] == None:
-                # Se for a primeira casa após a peça atual
-                if i == 1:
-                    self.legal += [(self.row + i + 1, self.col)]
-                    # Adiciona todas as casas livres após a casa de captura
-                    for j in range(1, self.row + i + 2):
-                        if self.row + i + 1 + j <= self.size - 1 and board.chessboard[self.row + i + 1 + j][self.col] == None:
-                            self.legal += [(self.row + i + 1 + j, self.col)]
-                        else:
-                            end = True
-                            break
-                # Se não for a primeira casa, mas a casa anterior estiver livre
-                elif i > 1 and board.chessboard[self.row + i - 1][self.col] == None:
-                    self.legal += [(self.row + i + 1, self.col)]
-                    # Adiciona todas as casas livres após a casa de captura
-                    for j in range(1, self.row + i + 2):
-                        if self.row + i + 1 + j <= self.size - 1 and board.chessboard[self.row + i + 1 + j][self.col] == None:
-                            self.legal += [(self.row + i + 1 + j, self.col)]
-                        else:
-                            end = True
-                            break
-            if end:
-                break
-
-        # Verificação para cima
-        end = False
-        for i in range(1, self.row + 1):
-            if self.row - i - 1 >= 0 and board.chessboard[self.row - i][self.col] != None and (board.chessboard[self.row - i - 1][self.col] != None or board.chessboard[self.row - i][self.col].color == self.color):
-                break
-
-            if self.row - i - 1 >= 0 and board.chessboard[self.row - i][self.col] != None and board.chessboard[self.row - i][self.col].color != self.color and board.chessboard[self.row - i - 1][self.col] == None:
-                if i == 1:
-                    self.legal += [(self.row - i - 1, self.col)]
-                    for j in range(1, self.row - i):
-                        if self.row - i - 1 - j >= 0 and board.chessboard[self.row - i - 1 - j][self.col] == None:
-                            self.legal += [(self.row - i - 1 - j, self.col)]
-                        else:
-                            end = True
-                            break
-                elif i > 1 and board.chessboard[self.row - i + 1][self.col] == None:
-                    self.legal += [(self.row - i - 1, self.col)]
-                    for j in range(1, self.row - i):
-                        if self.row - i - 1 - j >= 0 and board.chessboard[self.row - i - 1 - j][self.col] == None:
-                            self.legal += [(self.row - i - 1 - j, self.col)]
-                        else:
-                            end = True
-                            break
-            if end:
-                break
-
-        # Verificação para a direita
-        end = False
-        for i in range(1, self.right + 1):
-            if self.col + i + 1 <= self.size - 1 and board.chessboard[self.row][self.col + i] != None and (board.chessboard[self.row][self.col + i + 1] != None or board.chessboard[self.row][self.col + i].color == self.color):
-                break
-
-            if self.col + i + 1 <= self.size - 1 and board.chessboard[self.row][self.col + i] != None and board.chessboard[self.row][self.col + i].color != self.color and board.chessboard[self.row][self.col + i + 1] == None:
-                if i == 1:
-                    self.legal += [(self.row, self.col + i + 1)]
-                    for j in range(1, self.col + i + 2):
-                        if self.col + i + 1 + j <= self.size - 1 and board.chessboard[self.row][self.col + i + 1 + j] == None:
-                            self.legal += [(self.row, self.col + i + 1 + j)]
-                        else:
-                            end = True
-                            break
-                elif i > 1 and board.chessboard[self.row][self.col + i - 1] == None:
-                    self.legal += [(self.row, self.col + i + 1)]
-                    for j in range(1, self.col + i + 2):
-                        if self.col + i + 1 + j <= self.size - 1 and board.chessboard[self.row][self.col + i + 1 + j] == None:
-                            self.legal += [(self.row, self.col + i + 1 + j)]
-                        else:
-                            end = True
-                            break
-            if end:
-                break
-
-        # Verificação para a esquerda
-        end = False
-        for i in range(1, self.col + 1):
-            if self.col - i - 1 >= 0 and board.chessboard[self.row][self.col - i] != None and (board.chessboard[self.row][self.col - i - 1] != None or board.chessboard[self.row][self.col - i].color == self.color):
-                break
-
-            if self.col - i - 1 >= 0 and board.chessboard[self.row][self.col - i] != None and board.chessboard[self.row][self.col - i].color != self.color and board.chessboard[self.row][self.col - i - 1] == None:
-                if i == 1:
-                    self.legal += [(self.row, self.col - i - 1)]
-                    for j in range(1, self.col - i):
-                        if self.col - i - 1 - j >= 0 and board.chessboard[self.row][self.col - i - 1 - j] == None:
-                            self.legal += [(self.row, self.col - i - 1 - j)]
-                        else:
-                            end = True
-                            break
-
-                elif i > 1 and board.chessboard[self.row][self.col - i + 1] == None:  # Isto é para evitar saltar sobre mais do que uma peça adversária consecutiva
-                    self.legal += [(self.row, self.col - i - 1)]
-                    for j in range(1, self.col - i):
-                        if self.col - i - 1 - j >= 0 and board.chessboard[self.row][self.col - i - 1 - j] == None:
-                            self.legal += [(self.row, self.col - i - 1 - j)]
-                        else:
-                            end = True
-                            break
-            if end:
-                break  # Isto é porque depois de encontrar uma peça para capturar e os espaços livres seguintes, o loop interno para e o loop externo
-                       # continua e pode haver outra peça adversária para capturar, mas não é suposto nos preocuparmos com essa, então isto quebra o loop externo
-
-        self.drop_out_range()
-
-
-    def drop_out_range(self):
-        """Remove as posições legais que estão fora do tabuleiro."""
-        drop = []
-        for i in range(len(self.legal)):
-            if self.legal[i][0] < 0 or self.legal[i][0] > self.size - 1 or self.legal[i][1] < 0 or self.legal[i][1] > self.size - 1:
-                drop.append(i)
-        self.legal = [self.legal[i] for i in range(len(self.legal)) if i not in drop]
\ No newline at end of file
+        # Baixo, cima, direita e esquerda
+        for dr, dc in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
+            # Avança pelas casas livres até encontrar uma peça
+            row, col = self.row + dr, self.col + dc
+            while 0 <= row < self.size and 0 <= col < self.size and board.chessboard[row][col] is None:
+                row, col = row + dr, col + dc
+            if not (0 <= row < self.size and 0 <= col < self.size) or board.chessboard[row][col].color == self.color:
+                continue
+
+            # Salta a peça adversária e pode parar em qualquer casa livre seguinte (não pode saltar duas peças seguidas)
+            row, col = row + dr, col + dc
+            while 0 <= row < self.size and 0 <= col < self.size and board.chessboard[row][col] is None:
+                self.legal += [(row, col)]
+                row, col = row + dr, col + dc
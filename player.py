@@ -13,7 +13,7 @@ class Player:
     Pode ser um jogador humano ou uma IA (Minimax, Monte Carlo ou Random).
     """
 
-    def __init__(self, player_type, depth_or_iterations, team, evaluation_function = 1):
+    def __init__(self, player_type, depth_or_iterations, team, evaluation_function = 1, time_limit = None, workers = 1):
         """
         Inicializa um jogador.
 
@@ -23,11 +23,28 @@ class Player:
                                        Para o jogador "Random", este parâmetro não é usado.
             team (tuple): A cor do jogador (WHITE ou BLACK).
             evaluation_function (int): A função de avaliação a ser usada pelo Minimax (1, 2 ou 3).
+            time_limit (float): Tempo máximo por jogada da IA em segundos (None para pesquisar sempre até à profundidade
+                                ou ao número de iterações indicado).
+            workers (int): Número de processos usados pelo Minimax e pelo Monte Carlo (1 para não pesquisar em paralelo).
         """
         self.type = player_type
         self.depth_or_iterations = depth_or_iterations
         self.team = team
         self.evaluation_function = evaluation_function
+        self.time_limit = time_limit
+        self.workers = workers
+        self.minimax = None  # Instância do Minimax mantida entre jogadas (conserva a tabela de transposição)
+        self.monte_carlo = None  # Instância do Monte Carlo mantida entre jogadas (conserva os processos auxiliares)
+
+
+    def close(self):
+        """Termina os processos e liberta a memória partilhada das pesquisas da IA (se existirem)."""
+        if self.minimax is not None:
+            self.minimax.close()
+            self.minimax = None
+        if self.monte_carlo is not None:
+            self.monte_carlo.close()
+            self.monte_carlo = None
 
 
     def get_ai_move(self, board):
@@ -42,63 +59,59 @@ class Player:
         """
 
         if self.type == "Minimax":
-            # Cria uma instância do Minimax
-            minimax = Minimax(self.depth_or_iterations)
+            # Cria uma instância do Minimax (só na primeira jogada)
+            if self.minimax is None:
+                self.minimax = Minimax(self.depth_or_iterations, time_limit=self.time_limit, workers=self.workers)
             # Executa o Minimax para obter o melhor movimento
-            best_piece_pos, best_move = minimax.execute_minimax(board, self.depth_or_iterations, self.team, self.evaluation_function)
+            best_move = self.minimax.execute_minimax(board, self.depth_or_iterations, self.team, self.evaluation_function)
             # Realiza o movimento no tabuleiro
-            return self.make_ai_move(board, best_piece_pos, best_move)
+            return self.make_ai_move(board, best_move)
 
         elif self.type == "Montecarlo":
-            # Cria uma instância do MontecarloTreeSearch
-            monte_carlo = MontecarloTreeSearch(self.depth_or_iterations)
+            # Cria uma instância do MontecarloTreeSearch (só na primeira jogada)
+            if self.monte_carlo is None:
+                self.monte_carlo = MontecarloTreeSearch(self.depth_or_iterations, workers=self.workers, time_limit=self.time_limit)
             # Executa o Monte Carlo Tree Search para obter o melhor movimento
-            best_piece_pos, best_move = monte_carlo.mcts(board, self.team)
+            best_move = self.monte_carlo.mcts(board, self.team)
             # Realiza o movimento no tabuleiro
-            return self.make_ai_move(board, best_piece_pos, best_move)
+            return self.make_ai_move(board, best_move)
 
         elif self.type == "Random":
-            # Obtém todos os movimentos válidos para o jogador atual
-            legal_pieces, legal_moves = board.find_available_moves(self.team)
+            # Obtém todos os movimentos válidos para o jogador atual (capturas múltiplas completas)
+            moves = board.get_all_moves(self.team)
 
             # Se não houver movimentos válidos, retorna None
-            if not legal_pieces:
+            if not moves:
                 return None
 
             # Escolhe uma peça aleatória
-            piece_index = random.randint(0, len(legal_pieces) - 1)
-            piece = legal_pieces[piece_index]
+            start = random.choice(list(dict.fromkeys(move[0] for move in moves)))
 
             # Escolhe um movimento aleatório para a peça
-            move_index = random.randint(0, len(legal_moves[piece_index]) - 1)
-            move = legal_moves[piece_index][move_index]
+            move = random.choice([move for move in moves if move[0] == start])
 
             # Realiza o movimento no tabuleiro
-            best_piece_pos = (piece.row, piece.col)
-            best_move = move
-            return self.make_ai_move(board, best_piece_pos, best_move)
+            return self.make_ai_move(board, move)
 
 
-    def make_ai_move(self, board, best_piece_pos, best_move):
+    def make_ai_move(self, board, move):
         """
         Realiza o movimento da IA no tabuleiro.
 
+        O movimento inclui a captura múltipla completa, pelo que no fim a peça já
+        foi promovida (se for o caso) e o turno do tabuleiro já passou ao adversário.
+
         Args:
             board (Board): O tabuleiro do jogo.
-            best_piece_pos (tuple): A posição da peça a ser movida.
-            best_move (tuple): A posição para onde a peça deve ser movida.
+            move (tuple): O caminho da peça ((row, col), (new_row, new_col), ...).
 
         Returns:
             Piece: A peça que foi movida.
         """
         # Obtém a peça na posição especificada
-        selected_piece = board.chessboard[best_piece_pos[0]][best_piece_pos[1]]
-        # Remove a peça da posição antiga
-        board.chessboard[selected_piece.row][selected_piece.col] = None
-        # Move a peça para a nova posição
-        selected_piece.move(best_move[0], best_move[1], board)
-        # Atualiza a posição da peça no tabuleiro
-        board.chessboard[selected_piece.row][selected_piece.col] = selected_piece
+        selected_piece = board.chessboard[move[0][0]][move[0][1]]
+        # Executa o movimento completo (o tabuleiro atualiza o índice de casas)
+        board.make_move(move)
         return selected_piece
 
 
@@ -137,6 +150,7 @@ class Player:
                         gui.square_size = square_size
                         board=Board(size)
                         board.start_game(gui, screen)
+                        self.close()  # As pesquisas do jogo anterior não são reaproveitadas
                         player1 = Player(players[0], players[2], WHITE)
                         player2 = Player(players[1], players[3], BLACK)
                         selected_piece = None
@@ -205,10 +219,7 @@ class Player:
                         # Se a posição clicada for um movimento legal
                         if (row, col) in selected_piece.legal:  # Se o quadrado selecionado é um movimento legal para a peça
 
-                            board.chessboard[selected_piece.row][selected_piece.col] = None  # MATRIZ
-
-                            selected_piece.move(row, col, board)  # Move
-                            board.chessboard[selected_piece.row][selected_piece.col] = selected_piece  # MATRIZ
+                            selected_piece.move(row, col, board)  # Move (o tabuleiro atualiza a matriz)
                             human_playing = False
 
                             board.actual_state(screen)
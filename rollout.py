@@ -0,0 +1,334 @@
+from vars import *
+from bitboard import iter_bits
+
+try:
+    import numpy as np
+except ImportError:  # O NumPy é opcional: sem ele o MCTS usa as simulações normais
+    np = None
+
+# Planos de cada jogo (uma linha de casas por plano)
+WHITE_MEN, WHITE_KINGS, BLACK_MEN, BLACK_KINGS = range(4)
+
+
+def evaluation_weights(size, evaluation_func):
+    """
+    Escreve uma função de avaliação do Minimax como pesos de cada plano e casa.
+
+    As três funções são lineares nas peças e simétricas entre as cores, pelo
+    que o valor do ponto de vista das brancas é a soma dos planos multiplicados
+    por estes pesos.
+
+    Args:
+        size (int): O tamanho do tabuleiro.
+        evaluation_func (int): A função de avaliação (1, 2 ou 3), como em Minimax.evaluate_board.
+
+    Returns:
+        ndarray: Os pesos (4 x casas) do ponto de vista das brancas.
+    """
+    rows = np.repeat(np.arange(size), size)
+    weights = np.ones((4, size * size))
+    if evaluation_func == 1:
+        # Peças, damas (valem mais 2) e avanço das peças em direção à promoção
+        weights[WHITE_KINGS] += 2
+        weights[[WHITE_MEN, WHITE_KINGS]] += size - 1 - rows
+        weights[BLACK_KINGS] += 2
+        weights[[BLACK_MEN, BLACK_KINGS]] += rows
+    elif evaluation_func == 3:
+        # Peças e damas (valem mais 5)
+        weights[[WHITE_KINGS, BLACK_KINGS]] += 5
+    weights[[BLACK_MEN, BLACK_KINGS]] *= -1
+    return weights
+
+
+class RolloutEngine:
+    """
+    Simula muitos jogos aleatórios ao mesmo tempo com NumPy.
+
+    Cada jogo é uma linha de um array int8 com quatro planos (peças e damas de
+    cada cor) de size * size casas. Todos os movimentos possíveis no tabuleiro
+    (casa de partida, direção e distância) são enumerados uma vez; em cada
+    passo calcula-se para todos os jogos, com operações vetoriais, quais desses
+    movimentos são legais, escolhe-se um ao acaso e aplica-se a captura e a
+    promoção. Cada passo é um salto: numa captura múltipla a mesma peça continua
+    a jogar no passo seguinte, como em BitBoard.move.
+    """
+
+    def __init__(self, size, seed=None):
+        """
+        Prepara as tabelas de movimentos para um tamanho de tabuleiro.
+
+        Args:
+            size (int): O tamanho do tabuleiro.
+            seed (int): A semente dos números aleatórios (None para uma semente aleatória).
+        """
+        if np is None:
+            raise ImportError("RolloutEngine precisa do NumPy")
+        self.size = size
+        self.draw_limit = size * 7  # Movimentos sem capturas até ao empate (como em check_winner)
+        self.rng = np.random.default_rng(seed)
+
+        squares = size * size
+        # Raios: as casas de cada direção a partir de cada casa, terminados na casa fictícia "squares" (fora do tabuleiro)
+        self.rays = np.full((squares * len(ALL_DIRECTIONS), size), squares)
+        ray_origins, ray_forward, ray_orthogonal = [], [], []
+        origins, targets, rays, distances = [], [], [], []
+        for square in range(squares):
+            row, col = divmod(square, size)
+            for direction, (dr, dc) in enumerate(ALL_DIRECTIONS):
+                ray = square * len(ALL_DIRECTIONS) + direction
+                ray_origins.append(square)
+                ray_forward.append(dr)
+                ray_orthogonal.append(dr == 0 or dc == 0)
+                r, c, distance = row + dr, col + dc, 1
+                while 0 <= r < size and 0 <= c < size:
+                    self.rays[ray, distance - 1] = r * size + c
+                    origins.append(square)
+                    targets.append(r * size + c)
+                    rays.append(ray)
+                    distances.append(distance)
+                    r, c, distance = r + dr, c + dc, distance + 1
+
+        self.ray_origin = np.array(ray_origins)  # Casa de partida de cada raio
+        self.ray_row_step = np.array(ray_forward)  # Direção vertical de cada raio (-1, 0 ou 1)
+        self.ray_orthogonal = np.array(ray_orthogonal)  # Só os raios em linha ou coluna capturam
+        self.origin = np.array(origins)  # Casa de partida de cada movimento
+        self.target = np.array(targets)  # Casa de chegada de cada movimento
+        self.ray = np.array(rays)  # Raio em que está cada movimento
+        # Casas entre a partida e a chegada de cada movimento (as peças capturadas estão aí)
+        self.between = np.zeros((len(origins), squares), dtype=bool)
+        for index, (ray, distance) in enumerate(zip(rays, distances)):
+            self.between[index, self.rays[ray, :distance - 1]] = True
+
+        # Peso de cada casa em cada raio: o bit da sua distância à casa de partida
+        self.ray_weights = np.zeros((squares + 1, len(self.rays)), dtype=np.float32)
+        for ray, cells in enumerate(self.rays):
+            np.add.at(self.ray_weights[:, ray], cells, 1 << np.arange(size))
+
+        # Movimento correspondente a cada raio e distância
+        self.move_index = np.zeros((len(self.rays), size), dtype=np.int64)
+        self.move_index[rays, np.array(distances) - 1] = np.arange(len(origins))
+
+        # Tabelas das máscaras de um raio (bit i = casa à distância i + 1): distância da primeira
+        # casa marcada, número de casas marcadas e distância da n-ésima casa marcada
+        self.full_ray = (1 << size) - 1
+        self.first_bit = np.zeros(1 << size, dtype=np.int32)
+        self.bit_count = np.zeros(1 << size, dtype=np.int32)
+        self.nth_bit = np.zeros((1 << size, size), dtype=np.int32)
+        for mask in range(1, 1 << size):
+            distances_set = [bit + 1 for bit in range(size) if mask >> bit & 1]
+            self.first_bit[mask] = distances_set[0]
+            self.bit_count[mask] = len(distances_set)
+            self.nth_bit[mask, :len(distances_set)] = distances_set
+
+
+    def encode(self, bitboard):
+        """
+        Converte uma posição em máscaras de bits para os planos de um jogo.
+
+        Args:
+            bitboard (BitBoard): A posição.
+
+        Returns:
+            tuple: Os planos (4 x casas, int8), o turno (0 brancas, 1 pretas), a casa da
+                   peça a meio de uma captura (-1 se não houver) e o contador de movimentos sem capturas.
+        """
+        planes = np.zeros((4, self.size * self.size), dtype=np.int8)
+        masks = (bitboard.white_men, bitboard.white_kings, bitboard.black_men, bitboard.black_kings)
+        for plane, bits in enumerate(masks):
+            for square in iter_bits(bits):
+                planes[plane, square] = 1
+        turn = 0 if bitboard.turn == WHITE else 1
+        capturing = -1 if bitboard.capturing_square is None else bitboard.capturing_square
+        return planes, turn, capturing, bitboard.moves_whitout_catching
+
+
+    def ray_bits(self, planes, turn):
+        """
+        Converte o conteúdo dos raios de cada jogo em máscaras de bits.
+
+        Args:
+            planes (ndarray): Os planos dos jogos (jogos x 4 x casas).
+            turn (ndarray): O jogador a jogar em cada jogo (0 ou 1).
+
+        Returns:
+            tuple: Máscaras jogos x raios das peças normais e das damas do jogador a jogar na casa
+                   de partida, e máscaras de bits das casas ocupadas (incluindo o fim do tabuleiro),
+                   das peças próprias e das peças adversárias ao longo de cada raio.
+        """
+        white = (turn == 0)[:, None]
+        own_men = np.where(white, planes[:, WHITE_MEN], planes[:, BLACK_MEN])
+        own_kings = np.where(white, planes[:, WHITE_KINGS], planes[:, BLACK_KINGS])
+        enemy = np.where(white, planes[:, BLACK_MEN] | planes[:, BLACK_KINGS], planes[:, WHITE_MEN] | planes[:, WHITE_KINGS])
+
+        games = len(turn)
+        squares = self.size * self.size
+        own = np.zeros((games, squares + 1), dtype=bool)
+        own[:, :-1] = own_men | own_kings
+        opponent = np.zeros((games, squares + 1), dtype=bool)
+        opponent[:, :-1] = enemy
+        occupied = own | opponent
+        occupied[:, -1] = True  # O fim do tabuleiro trava as peças como uma casa ocupada
+
+        # Um só produto de matrizes dá as três máscaras de todos os raios
+        cells = np.concatenate((occupied, own, opponent)).astype(np.float32)
+        bits = (cells @ self.ray_weights).astype(np.int32).reshape(3, games, -1)
+        return (own_men[:, self.ray_origin] == 1, own_kings[:, self.ray_origin] == 1, bits[0], bits[1], bits[2])
+
+
+    def capture_mask(self, features, capturing):
+        """
+        Calcula as capturas legais de cada jogo, como máscaras de distâncias por raio.
+
+        Args:
+            features (tuple): O resultado de ray_bits.
+            capturing (ndarray): A casa da peça a meio de uma captura em cada jogo (-1 se não houver).
+
+        Returns:
+            ndarray: Máscara de bits jogos x raios das distâncias de captura legais.
+        """
+        man, king, occupied, own, enemy = features
+        first = self.first_bit[occupied]
+        second = self.first_bit[occupied & ~(1 << (first - 1))]
+        # A primeira peça do raio é adversária: a dama pode parar em qualquer casa livre depois dela
+        over_enemy = (enemy >> (first - 1)) & 1 & self.ray_orthogonal
+        landing = ((1 << (second - 1)) - 1) & ~((1 << first) - 1)
+        # A peça normal só captura o adversário adjacente, parando logo a seguir
+        mask = np.where(king, landing, np.where(man & (first == 1), landing & 2, 0)) * over_enemy
+        # A meio de uma captura múltipla só a mesma peça pode continuar
+        if (capturing >= 0).any():
+            mask *= (capturing[:, None] < 0) | (self.ray_origin == capturing[:, None])
+        return mask
+
+
+    def legal_mask(self, planes, turn, capturing):
+        """
+        Calcula os movimentos legais de cada jogo (só capturas, se houver alguma).
+
+        Args:
+            planes (ndarray): Os planos dos jogos.
+            turn (ndarray): O jogador a jogar em cada jogo.
+            capturing (ndarray): A casa da peça a meio de uma captura em cada jogo (-1 se não houver).
+
+        Returns:
+            tuple: Máscara de bits jogos x raios das distâncias legais e, para cada jogo, se os movimentos são capturas.
+        """
+        features = self.ray_bits(planes, turn)
+        man, king, occupied, own, enemy = features
+        captures = self.capture_mask(features, capturing)
+
+        # Peça normal: para a frente, até à primeira casa sem peça própria (se estiver livre)
+        forward = np.where(turn == 0, -1, 1)[:, None]
+        stop_bit = 1 << (self.first_bit[~own & self.full_ray] - 1)
+        man_moves = np.where(man & (self.ray_row_step == forward) & (occupied & stop_bit == 0), stop_bit, 0)
+        # Dama: desliza pelas casas livres
+        king_moves = np.where(king, (1 << (self.first_bit[occupied] - 1)) - 1, 0)
+
+        has_capture = captures.any(axis=1)
+        return np.where(has_capture[:, None], captures, man_moves | king_moves), has_capture
+
+
+    def play(self, bitboard, games, max_steps=None, weights=None):
+        """
+        Joga vários jogos aleatórios até ao fim (ou até um limite de movimentos) a partir da mesma posição.
+
+        Args:
+            bitboard (BitBoard): A posição inicial.
+            games (int): O número de jogos.
+            max_steps (int): O número máximo de movimentos (saltos) de cada jogo (None para jogar até ao fim).
+            weights (ndarray): Pesos de evaluation_weights que decidem os jogos interrompidos
+                               (None para os contar como empates).
+
+        Returns:
+            ndarray: O resultado de cada jogo: 1 se as brancas ganharam, -1 se as pretas ganharam, 0 se empataram.
+        """
+        start, turn, capturing, counter = self.encode(bitboard)
+        planes = np.repeat(start[None], games, axis=0)
+        turn = np.full(games, turn, dtype=np.int8)
+        capturing = np.full(games, capturing, dtype=np.int16)
+        counter = np.full(games, counter, dtype=np.int16)
+        results = np.zeros(games, dtype=np.int8)
+        alive = np.arange(games)  # Jogos ainda a decorrer
+
+        steps = 0
+        while alive.size:
+            if max_steps is not None and steps >= max_steps:
+                # Jogos interrompidos: decididos pelo sinal da avaliação
+                if weights is not None:
+                    results[alive] = np.sign((planes * weights).sum(axis=(1, 2)))
+                break
+            steps += 1
+
+            moves, captured = self.legal_mask(planes, turn, capturing)
+            counts = self.bit_count[moves]
+            total = counts.sum(axis=1)
+
+            # Quem não se pode mover perde; ao fim de muitos movimentos sem capturas é empate
+            stuck = total == 0
+            results[alive[stuck]] = np.where(turn[stuck] == 0, -1, 1)
+            running = ~stuck & (counter < self.draw_limit)
+            if not running.all():
+                alive, planes, turn, capturing, counter = alive[running], planes[running], turn[running], capturing[running], counter[running]
+                moves, captured, counts, total = moves[running], captured[running], counts[running], total[running]
+                if not alive.size:
+                    break
+
+            # Escolhe um movimento legal ao acaso em cada jogo: primeiro o raio, depois a distância
+            games = np.arange(alive.size)
+            pick = (self.rng.random(alive.size) * total).astype(np.int32)
+            cumulative = counts.cumsum(axis=1)
+            ray = (cumulative <= pick[:, None]).sum(axis=1)
+            offset = pick - cumulative[games, ray] + counts[games, ray]
+            distance = self.nth_bit[moves[games, ray], offset]
+            choice = self.move_index[ray, distance - 1]
+            turn, capturing, counter = self.apply(planes, turn, counter, choice, captured)
+        return results
+
+
+    def apply(self, planes, turn, counter, choice, captured):
+        """
+        Aplica o movimento escolhido em cada jogo (os planos são alterados no próprio array).
+
+        Args:
+            planes (ndarray): Os planos dos jogos.
+            turn (ndarray): O jogador a jogar em cada jogo.
+            counter (ndarray): O contador de movimentos sem capturas de cada jogo.
+            choice (ndarray): O índice do movimento escolhido em cada jogo.
+            captured (ndarray): Se o movimento de cada jogo é uma captura.
+
+        Returns:
+            tuple: O novo turno, a casa da peça a meio de uma captura e o novo contador de cada jogo.
+        """
+        games = np.arange(len(choice))
+        origin = self.origin[choice]
+        target = self.target[choice]
+        white = turn == 0
+        own_plane = np.where(white, WHITE_MEN, BLACK_MEN)
+        enemy_plane = np.where(white, BLACK_MEN, WHITE_MEN)
+
+        # Move a peça (normal ou dama)
+        king = planes[games, own_plane + 1, origin] == 1
+        plane = own_plane + king
+        planes[games, plane, origin] = 0
+        planes[games, plane, target] = 1
+
+        # Remove as peças adversárias no caminho
+        keep = (~self.between[choice]).astype(np.int8)
+        planes[games, enemy_plane] &= keep
+        planes[games, enemy_plane + 1] &= keep
+        counter = np.where(captured, 0, counter + 1).astype(np.int16)
+
+        # Captura múltipla: a peça continua se ainda puder capturar
+        continues = np.zeros(len(choice), dtype=bool)
+        if captured.any():
+            chain = np.flatnonzero(captured)
+            features = self.ray_bits(planes[chain], turn[chain])
+            continues[chain] = self.capture_mask(features, target[chain].astype(np.int16)).any(axis=1)
+        capturing = np.where(continues, target, -1).astype(np.int16)
+
+        # Fim do movimento: promoção a dama na última linha e mudança de turno
+        last_row = np.where(white, 0, self.size - 1)
+        promote = ~continues & ~king & (target // self.size == last_row)
+        planes[games[promote], plane[promote], target[promote]] = 0
+        planes[games[promote], plane[promote] + 1, target[promote]] = 1
+        turn = np.where(continues, turn, 1 - turn).astype(np.int8)
+        return turn, capturing, counter
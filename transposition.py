@@ -0,0 +1,363 @@
+import weakref
+from multiprocessing import shared_memory
+
+# Tipos de limite guardados numa entrada
+EXACT = 0  # O valor é exato
+LOWER_BOUND = 1  # O valor é um limite inferior (houve um corte Beta)
+UPPER_BOUND = 2  # O valor é um limite superior (nenhum movimento melhorou Alpha)
+
+# Estimativa da memória ocupada por uma entrada (tuplo, inteiros e referências das listas)
+ENTRY_BYTES = 168
+BUCKET_BYTES = 2 * ENTRY_BYTES  # Cada balde tem duas entradas
+
+
+class TranspositionTable:
+    """
+    Tabela de transposição de tamanho fixo para o Minimax.
+
+    Guarda, para cada posição (chave de Zobrist), a profundidade pesquisada, o
+    valor, o tipo de limite e o melhor movimento. Cada balde tem duas entradas:
+    uma que só é substituída por pesquisas mais profundas (ou de pesquisas
+    anteriores) e outra que é sempre substituída.
+    """
+
+    def __init__(self, megabytes=16):
+        """
+        Inicializa a tabela.
+
+        Args:
+            megabytes (float): Memória máxima (aproximada) a usar pela tabela.
+        """
+        self.megabytes = megabytes
+        self.size = max(1, int(megabytes * 1024 * 1024) // BUCKET_BYTES)  # Número de baldes
+        self.depth_preferred = [None] * self.size  # Entradas com preferência pela profundidade
+        self.always_replace = [None] * self.size  # Entradas substituídas sempre
+        self.generation = 0  # Número da pesquisa atual (as entradas antigas podem ser substituídas)
+        self.hits = 0  # Consultas que encontraram a posição
+        self.misses = 0  # Consultas que não encontraram a posição
+        self.collisions = 0  # Consultas em que o balde estava ocupado por outras posições
+        self.stores = 0  # Entradas guardadas
+
+
+    def new_search(self):
+        """Marca o início de uma nova pesquisa (as entradas anteriores passam a ser substituíveis)."""
+        self.generation += 1
+
+
+    def clear(self):
+        """Esvazia a tabela e reinicia os contadores."""
+        self.depth_preferred = [None] * self.size
+        self.always_replace = [None] * self.size
+        self.hits = self.misses = self.collisions = self.stores = 0
+
+
+    def probe(self, key):
+        """
+        Procura uma posição na tabela.
+
+        Args:
+            key (int): A chave de Zobrist da posição.
+
+        Returns:
+            tuple: A entrada (key, depth, score, flag, best_move, generation), ou None se não existir.
+        """
+        index = key % self.size
+        first = self.depth_preferred[index]
+        if first is not None and first[0] == key:
+            self.hits += 1
+            return first
+        second = self.always_replace[index]
+        if second is not None and second[0] == key:
+            self.hits += 1
+            return second
+
+        if first is not None or second is not None:
+            self.collisions += 1
+        self.misses += 1
+        return None
+
+
+    def store(self, key, depth, score, flag, best_move):
+        """
+        Guarda o resultado da pesquisa de uma posição.
+
+        Args:
+            key (int): A chave de Zobrist da posição.
+            depth (int): A profundidade pesquisada.
+            score (float): O valor encontrado.
+            flag (int): EXACT, LOWER_BOUND ou UPPER_BOUND.
+            best_move (tuple): O melhor movimento encontrado (ou None).
+        """
+        index = key % self.size
+        entry = (key, depth, score, flag, best_move, self.generation)
+        current = self.depth_preferred[index]
+        self.stores += 1
+
+        # Substitui a entrada preferida se estiver livre, for da mesma posição, for de uma pesquisa anterior ou menos profunda
+        if current is None or current[0] == key or current[5] != self.generation or depth >= current[1]:
+            if current is not None and current[0] != key:
+                self.always_replace[index] = current  # A entrada substituída ainda pode ser útil
+            self.depth_preferred[index] = entry
+        else:
+            self.always_replace[index] = entry
+
+
+    def stats(self):
+        """
+        Obtém os contadores da tabela.
+
+        Returns:
+            dict: Consultas, acertos, falhas, colisões, entradas guardadas, taxa de acertos e ocupação.
+        """
+        probes = self.hits + self.misses
+        used = sum(entry is not None for entry in self.depth_preferred) + sum(entry is not None for entry in self.always_replace)
+        return {
+            'probes': probes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'collisions': self.collisions,
+            'stores': self.stores,
+            'hit_rate': self.hits / probes if probes else 0.0,
+            'occupancy': used / (2 * self.size),
+        }
+
+
+# Tabela partilhada entre processos: cada entrada ocupa duas palavras de 64 bits
+# (chave XOR dados, dados), e o cabeçalho guarda o número da pesquisa atual
+WORD_MASK = (1 << 64) - 1
+SHARED_ENTRY_WORDS = 2
+SHARED_BUCKET_WORDS = 2 * SHARED_ENTRY_WORDS  # Cada balde tem duas entradas
+SHARED_HEADER_WORDS = 1
+SCORE_BITS = 24  # Os valores são inteiros guardados com um desvio de 2 ** (SCORE_BITS - 1)
+SCORE_OFFSET = 1 << (SCORE_BITS - 1)
+
+
+def pack_entry(depth, score, flag, best_move, generation):
+    """
+    Junta os dados de uma entrada da tabela partilhada numa palavra de 64 bits.
+
+    O melhor movimento fica reduzido à casa de partida e à casa de chegada
+    (3 bits por coordenada, o que chega para tabuleiros até 8x8).
+
+    Args:
+        depth (int): A profundidade pesquisada.
+        score (int): O valor encontrado.
+        flag (int): EXACT, LOWER_BOUND ou UPPER_BOUND.
+        best_move (tuple): O melhor movimento (ou None).
+        generation (int): O número da pesquisa.
+
+    Returns:
+        int: A palavra com os dados.
+    """
+    move_bits = 0
+    if best_move is not None:
+        (from_row, from_col), (to_row, to_col) = best_move[0], best_move[-1]
+        move_bits = 1 << 12 | from_row << 9 | from_col << 6 | to_row << 3 | to_col
+    return ((score + SCORE_OFFSET)
+            | min(depth, 255) << SCORE_BITS
+            | flag << (SCORE_BITS + 8)
+            | (generation & 255) << (SCORE_BITS + 10)
+            | move_bits << (SCORE_BITS + 18))
+
+
+def unpack_entry(key, data):
+    """
+    Separa os dados de uma entrada da tabela partilhada.
+
+    Args:
+        key (int): A chave de Zobrist da posição.
+        data (int): A palavra com os dados (de pack_entry).
+
+    Returns:
+        tuple: A entrada (key, depth, score, flag, best_move, generation), com o
+               melhor movimento na forma ((row, col), (new_row, new_col)).
+    """
+    score = (data & (SCORE_OFFSET * 2 - 1)) - SCORE_OFFSET
+    depth = data >> SCORE_BITS & 255
+    flag = data >> (SCORE_BITS + 8) & 3
+    generation = data >> (SCORE_BITS + 10) & 255
+    move_bits = data >> (SCORE_BITS + 18)
+    best_move = None
+    if move_bits:
+        best_move = ((move_bits >> 9 & 7, move_bits >> 6 & 7), (move_bits >> 3 & 7, move_bits & 7))
+    return (key, depth, score, flag, best_move, generation)
+
+
+def release_shared_memory(memory, words, unlink):
+    """
+    Liberta uma zona de memória partilhada e, se foi este processo que a criou, apaga-a.
+
+    Args:
+        memory (SharedMemory): A memória partilhada.
+        words (memoryview): A vista de palavras de 64 bits sobre a memória.
+        unlink (bool): Se a memória deve ser apagada.
+    """
+    words.release()
+    memory.close()
+    if unlink:
+        try:
+            memory.unlink()
+        except FileNotFoundError:
+            pass  # Já foi apagada
+
+
+class SharedTranspositionTable:
+    """
+    Tabela de transposição em memória partilhada, usada por vários processos ao mesmo tempo.
+
+    Tem os mesmos baldes e a mesma política de substituição que a
+    TranspositionTable, mas as entradas são palavras de 64 bits numa zona de
+    multiprocessing.shared_memory. Não há trincos: cada entrada guarda a chave
+    XOR os dados, e uma entrada escrita a meio por outro processo é detetada
+    (e ignorada) porque a verificação da chave falha.
+    """
+
+    def __init__(self, megabytes=16, name=None):
+        """
+        Cria a tabela, ou liga-se a uma tabela já criada por outro processo.
+
+        Args:
+            megabytes (float): Memória máxima a usar pela tabela.
+            name (str): O nome da memória partilhada a que se ligar (None para criar uma nova).
+        """
+        self.megabytes = megabytes
+        self.size = max(1, int(megabytes * 1024 * 1024) // (SHARED_BUCKET_WORDS * 8))  # Número de baldes
+        nbytes = (SHARED_HEADER_WORDS + self.size * SHARED_BUCKET_WORDS) * 8
+        if name is None:
+            self.memory = shared_memory.SharedMemory(create=True, size=nbytes)
+            self.owner = True  # Quem cria a tabela é quem a apaga
+        else:
+            self.memory = shared_memory.SharedMemory(name=name)
+            self.owner = False
+        self.name = self.memory.name
+        self.words = self.memory.buf.cast('Q')
+        # Liberta (e apaga) a memória mesmo que close nunca seja chamado: objeto descartado ou fim do programa
+        self.finalizer = weakref.finalize(self, release_shared_memory, self.memory, self.words, self.owner)
+        if self.owner:
+            self.clear()
+        # Contadores deste processo
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+        self.stores = 0
+
+
+    @property
+    def generation(self):
+        """Número da pesquisa atual (guardado no cabeçalho, comum a todos os processos)."""
+        return self.words[0]
+
+
+    def new_search(self):
+        """Marca o início de uma nova pesquisa (as entradas anteriores passam a ser substituíveis)."""
+        self.words[0] = (self.words[0] + 1) & 255
+
+
+    def clear(self):
+        """Esvazia a tabela e reinicia os contadores."""
+        self.memory.buf[:] = bytes(len(self.memory.buf))
+        self.hits = self.misses = self.collisions = self.stores = 0
+
+
+    def close(self):
+        """Liberta a memória partilhada (e apaga-a, se foi este processo que a criou)."""
+        self.finalizer()  # Só atua da primeira vez
+
+
+    def read(self, offset, key):
+        """
+        Lê uma entrada, verificando que pertence à posição e que não foi escrita a meio.
+
+        Args:
+            offset (int): A posição da entrada na memória (em palavras).
+            key (int): A chave de Zobrist da posição.
+
+        Returns:
+            tuple: A entrada, ou None se estiver vazia ou for de outra posição.
+        """
+        data = self.words[offset + 1]
+        if data and self.words[offset] ^ data == key:
+            return unpack_entry(key, data)
+        return None
+
+
+    def probe(self, key):
+        """
+        Procura uma posição na tabela.
+
+        Args:
+            key (int): A chave de Zobrist da posição.
+
+        Returns:
+            tuple: A entrada (key, depth, score, flag, best_move, generation), ou None se não existir.
+        """
+        offset = SHARED_HEADER_WORDS + (key % self.size) * SHARED_BUCKET_WORDS
+        for slot in (offset, offset + SHARED_ENTRY_WORDS):
+            entry = self.read(slot, key)
+            if entry is not None:
+                self.hits += 1
+                return entry
+
+        if self.words[offset + 1] or self.words[offset + SHARED_ENTRY_WORDS + 1]:
+            self.collisions += 1
+        self.misses += 1
+        return None
+
+
+    def store(self, key, depth, score, flag, best_move):
+        """
+        Guarda o resultado da pesquisa de uma posição.
+
+        Args:
+            key (int): A chave de Zobrist da posição.
+            depth (int): A profundidade pesquisada.
+            score (int): O valor encontrado.
+            flag (int): EXACT, LOWER_BOUND ou UPPER_BOUND.
+            best_move (tuple): O melhor movimento encontrado (ou None).
+        """
+        if not -SCORE_OFFSET < score < SCORE_OFFSET:
+            return  # Fora do intervalo que cabe na entrada
+        offset = SHARED_HEADER_WORDS + (key % self.size) * SHARED_BUCKET_WORDS
+        generation = self.generation
+        data = pack_entry(depth, int(score), flag, best_move, generation)
+        self.stores += 1
+
+        # Mesma política da TranspositionTable: a primeira entrada prefere a profundidade
+        current_data = self.words[offset + 1]
+        current_key = self.words[offset] ^ current_data
+        current_depth = current_data >> SCORE_BITS & 255
+        current_generation = current_data >> (SCORE_BITS + 10) & 255
+        if (not current_data or current_key == key or current_generation != generation
+                or depth >= current_depth):
+            if current_data and current_key != key:
+                # A entrada substituída ainda pode ser útil
+                self.words[offset + SHARED_ENTRY_WORDS] = self.words[offset]
+                self.words[offset + SHARED_ENTRY_WORDS + 1] = current_data
+            self.words[offset] = (key ^ data) & WORD_MASK
+            self.words[offset + 1] = data
+        else:
+            self.words[offset + SHARED_ENTRY_WORDS] = (key ^ data) & WORD_MASK
+            self.words[offset + SHARED_ENTRY_WORDS + 1] = data
+
+
+    def stats(self):
+        """
+        Obtém os contadores da tabela neste processo.
+
+        Returns:
+            dict: Consultas, acertos, falhas, colisões, entradas guardadas, taxa de acertos e ocupação.
+        """
+        probes = self.hits + self.misses
+        used = 0
+        for bucket in range(self.size):
+            offset = SHARED_HEADER_WORDS + bucket * SHARED_BUCKET_WORDS
+            used += bool(self.words[offset + 1]) + bool(self.words[offset + SHARED_ENTRY_WORDS + 1])
+        return {
+            'probes': probes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'collisions': self.collisions,
+            'stores': self.stores,
+            'hit_rate': self.hits / probes if probes else 0.0,
+            'occupancy': used / (2 * self.size),
+        }
@@ -10,3 +10,8 @@ GREY2 = (128, 180, 180)
 
 # Definição das dimensões da janela
 width, height = 550, 400
+
+# Direções (linha, coluna) no tabuleiro
+ORTHOGONAL = [(-1, 0), (1, 0), (0, -1), (0, 1)]  # Cima, baixo, esquerda, direita (direções das capturas)
+DIAGONAL = [(-1, -1), (-1, 1), (1, -1), (1, 1)]
+ALL_DIRECTIONS = ORTHOGONAL + DIAGONAL  # Direções dos movimentos das damas
@@ -0,0 +1,32 @@
+import random
+from vars import *
+
+_keys = {}  # Chaves já geradas para cada tamanho de tabuleiro
+
+
+def zobrist_keys(size):
+    """
+    Obtém as chaves de Zobrist (inteiros aleatórios de 64 bits) para um tamanho de tabuleiro.
+
+    Há uma chave por casa, cor e tipo de peça (normal ou dama), uma chave para
+    o turno das pretas e uma chave por valor do contador de movimentos sem
+    capturas (até ao empate). As chaves são geradas com uma semente fixa, pelo
+    que são iguais em todas as execuções e em todos os processos.
+
+    Args:
+        size (int): O tamanho do tabuleiro (5 a 8).
+
+    Returns:
+        dict: 'pieces' -> {(cor, dama): matriz size x size de chaves}, 'turn' -> chave do turno,
+              'quiet' -> lista de chaves indexada pelo contador de movimentos sem capturas.
+    """
+    if size not in _keys:
+        generator = random.Random(size)
+        pieces = {}
+        for color in (WHITE, BLACK):
+            for king in (False, True):
+                pieces[(color, king)] = [[generator.getrandbits(64) for col in range(size)] for row in range(size)]
+        turn = generator.getrandbits(64)
+        quiet = [generator.getrandbits(64) for count in range(size * 7 + 1)]  # O jogo empata ao fim de size * 7
+        _keys[size] = {'pieces': pieces, 'turn': turn, 'quiet': quiet}
+    return _keys[size]